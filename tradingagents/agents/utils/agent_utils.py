@@ -112,9 +112,7 @@ def timing_wrapper(analyst_type, timeout_seconds=120, uses_web_search=False):
                             }
                         }
                         
-                        app_state.tool_calls_log.append(tool_call_info)
-                        app_state.tool_calls_count = len(app_state.tool_calls_log)
-                        app_state.needs_ui_update = True
+                        app_state.register_tool_call(tool_call_info)
                         
                         # Return a timeout error message
                         return f"Error: Tool '{tool_name}' timed out after {timeout_seconds}s. This may indicate network issues, API problems, or insufficient data."
@@ -141,9 +139,7 @@ def timing_wrapper(analyst_type, timeout_seconds=120, uses_web_search=False):
                     "symbol": current_symbol  # Add symbol for filtering
                 }
                 
-                app_state.tool_calls_log.append(tool_call_info)
-                app_state.tool_calls_count = len(app_state.tool_calls_log)
-                app_state.needs_ui_update = True
+                app_state.register_tool_call(tool_call_info)
                 print(f"[TOOL TRACKER] Registered tool call: {tool_name} for {analyst_type} (Total: {app_state.tool_calls_count})")
                 
                 return result
@@ -202,9 +198,7 @@ def timing_wrapper(analyst_type, timeout_seconds=120, uses_web_search=False):
                         "error_details": error_details  # Add structured error details
                     }
                     
-                    app_state.tool_calls_log.append(tool_call_info)
-                    app_state.tool_calls_count = len(app_state.tool_calls_log)
-                    app_state.needs_ui_update = True
+                    app_state.register_tool_call(tool_call_info)
                     print(f"[TOOL TRACKER] Registered failed tool call: {tool_name} for {analyst_type} (Total: {app_state.tool_calls_count})")
                 except Exception as track_error:
                     print(f"[TOOL TRACKER] Failed to track failed tool call: {track_error}")
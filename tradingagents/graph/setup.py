@@ -157,9 +157,8 @@ class GraphSetup:
                         if report_content:
                             ticker = state.get("company_of_interest", "")
                             if ticker:
-                                ui_state = app_state.get_state(ticker)
-                                if ui_state:
-                                    ui_state["current_reports"][report_field] = report_content
+                                if app_state.get_state(ticker):
+                                    app_state.store_report(report_field, report_content, ticker)
                                     print(f"[PARALLEL] Real-time update: {analyst_type} report ({len(report_content)} chars) stored for {ticker}")
                     
                     return analyst_type, final_state
@@ -238,9 +237,7 @@ class GraphSetup:
                     if ui_available:
                         ticker = state.get("ticker", "")
                         if ticker:
-                            ui_state = app_state.get_state(ticker)
-                            if ui_state:
-                                ui_state["current_reports"][report_field] = content
+                            app_state.store_report(report_field, content, ticker)
                 else:
                     # Ensure the field exists even if empty
                     if report_field not in final_state:
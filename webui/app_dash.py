@@ -24,7 +24,7 @@ from webui.callbacks import register_all_callbacks
 def apply_sequential_mode_fix():
     """Apply fix for sequential execution mode report mapping bug"""
     try:
-        from webui.utils.state import AppState
+        from webui.utils.state import AGENT_INDEX, STATUS_IN_PROGRESS, AppState
         
         # Check if fix is already applied
         if hasattr(AppState, '_mapping_fix_applied'):
@@ -41,8 +41,7 @@ def apply_sequential_mode_fix():
             if current_symbol:
                 state = self.get_state(current_symbol)
                 if state:
-                    social_status = state["agent_statuses"].get("Social Analyst")
-                    if social_status == "in_progress":
+                    if state.status_codes[AGENT_INDEX["Social Analyst"]] == STATUS_IN_PROGRESS:
                         chunk_fields = list(chunk.keys())
                         # print(f"[DEBUG] Social Analyst chunk received: {chunk_fields}")
                         
@@ -115,6 +114,14 @@ def run_app(port=7860, share=False, server_name="127.0.0.1", debug=False, max_th
     else:
         print("Starting TradingAgents Web UI...")
     
+    # Print the webui modules' INFO diagnostics (e.g. state transitions) to the console
+    webui_logger = logging.getLogger("webui")
+    if not webui_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        webui_logger.addHandler(handler)
+        webui_logger.setLevel(logging.INFO)
+    
     # Suppress verbose HTTP request logs from Werkzeug
     logging.getLogger("werkzeug").setLevel(logging.WARNING)
     # Optionally also silence Dash's callback exceptions logger
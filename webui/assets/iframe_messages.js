@@ -0,0 +1,49 @@
+/*
+ * Handle messages posted by report iframes (e.g. the debate views) and open
+ * the matching prompt modal in the parent page. Served from Dash's assets
+ * folder so the browser can cache it; registering a window listener does not
+ * need the DOM, so it is safe to run from the document head.
+ */
+
+// Show-prompt buttons keyed by report type. Buttons are rendered by Dash
+// callbacks after load, so the registry is refreshed lazily on a miss.
+const PROMPT_BUTTONS = {};
+
+function registerPromptButtons() {
+    document.querySelectorAll('.show-prompt-btn').forEach(function(button) {
+        // Pattern-matching ids are rendered as JSON, e.g. {"report":"bull_report","type":"show-prompt-btn"}
+        try {
+            const reportType = JSON.parse(button.id).report;
+            if (reportType) {
+                PROMPT_BUTTONS[reportType] = button;
+            }
+        } catch (e) {
+            // Not a pattern-matching id, ignore
+        }
+    });
+}
+
+function findPromptButton(reportType) {
+    let button = PROMPT_BUTTONS[reportType];
+    if (!button || !button.isConnected) {
+        registerPromptButtons();
+        button = PROMPT_BUTTONS[reportType];
+    }
+    return button && button.isConnected ? button : null;
+}
+
+document.addEventListener('DOMContentLoaded', registerPromptButtons);
+
+window.addEventListener('message', function(event) {
+    if (event.data && event.data.type === 'showPrompt') {
+        const reportType = event.data.reportType;
+        const targetButton = findPromptButton(reportType);
+
+        // Trigger the button click if found
+        if (targetButton) {
+            targetButton.click();
+        } else {
+            console.log('Could not find button for:', reportType);
+        }
+    }
+});
@@ -92,8 +92,6 @@ def register_api_config_callbacks(app):
         import dash_bootstrap_components as dbc
         from dash import html
         
-        defaults = get_default_api_keys()
-        
         # Check if .env file exists
         load_dotenv()
         env_vars = {
@@ -304,7 +304,7 @@ def register_report_callbacks(app):
             return create_markdown_content("", f"No active analysis for {symbol}. Researcher debate will appear here once analysis starts.")
 
         # Get the debate state
-        debate_state = state.get("investment_debate_state")
+        debate_state = state.investment_debate_state
         
         if not debate_state or not debate_state.get("history"):
             return create_markdown_content("", "Researcher debate will begin once analysis starts.")
@@ -483,7 +483,7 @@ def register_report_callbacks(app):
             return create_markdown_content("", f"No active analysis for {symbol}. Risk debate will appear here once analysis starts.")
 
         # Get the risk debate state
-        risk_debate_state = state.get("risk_debate_state")
+        risk_debate_state = state.risk_debate_state
         
         if not risk_debate_state or not risk_debate_state.get("history"):
             return create_markdown_content("", "Risk debate will begin once analysis starts.")
@@ -727,13 +727,13 @@ def register_report_callbacks(app):
         
         symbol = symbols_list[active_page - 1]
         # print(f"[REPORTS] Selected symbol: {symbol} (page {active_page})")
-        state = app_state.get_state(symbol)
+        # Statuses and reports are read from one snapshot so they cannot disagree mid-update
+        snapshot = app_state.get_report_snapshot(symbol)
         
-        if not state:
+        if not snapshot:
             return [create_markdown_content("", "No data for this symbol.")] * 8
             
-        reports = state["current_reports"]
-        agent_statuses = state["agent_statuses"]
+        agent_statuses, reports = snapshot
         
         # 🛡️ VALIDATION: Only show complete reports in UI
         # For analysts marked as "completed", validate reports are actually complete
@@ -821,65 +821,65 @@ def register_report_callbacks(app):
         if not state:
             return "No data for this symbol."
 
-        reports = state["current_reports"]
+        reports = state.current_reports
         final_report_content = reports.get("final_trade_decision")
 
         # A race condition can occur where the final report is generated but the analysis_complete flag is not yet set.
         # We should only show the final decision when the state is confirmed as complete.
-        if state.get("analysis_complete") and final_report_content is not None:
-            if state["analysis_results"]:
-                decision_text = f"## Final Decision for {state['ticker_symbol']}\n\n"
-                decision_text += f"**Trade Action:** {state['analysis_results'].get('decision', 'No decision')}\n\n"
-                decision_text += "**Date:** " + state['analysis_results'].get("date", "N/A")
+        if state.analysis_complete and final_report_content is not None:
+            if state.analysis_results:
+                decision_text = f"## Final Decision for {state.ticker_symbol}\n\n"
+                decision_text += f"**Trade Action:** {state.analysis_results.get('decision', 'No decision')}\n\n"
+                decision_text += "**Date:** " + state.analysis_results.get("date", "N/A")
             else:
                 # Show the recommended action if available
-                decision_text = f"## Final Decision for {state['ticker_symbol']}\n\n"
+                decision_text = f"## Final Decision for {state.ticker_symbol}\n\n"
                 
                 # Display the extracted recommendation prominently
-                if "recommended_action" in state and state["recommended_action"]:
-                    decision_text += f"**📈 RECOMMENDED ACTION: {state['recommended_action']}**\n\n"
+                if state.recommended_action:
+                    decision_text += f"**📈 RECOMMENDED ACTION: {state.recommended_action}**\n\n"
                 
                 decision_text += "**Full Analysis:**\n"
                 decision_text += final_report_content
         else:
             # Show partial decision summary based on available reports
             available_reports = []
-            if state["current_reports"].get("market_report"):
+            if state.current_reports.get("market_report"):
                 available_reports.append("Market Analysis")
-            if state["current_reports"].get("sentiment_report"):
+            if state.current_reports.get("sentiment_report"):
                 available_reports.append("Social Media Sentiment")
-            if state["current_reports"].get("news_report"):
+            if state.current_reports.get("news_report"):
                 available_reports.append("News Analysis")
-            if state["current_reports"].get("fundamentals_report"):
+            if state.current_reports.get("fundamentals_report"):
                 available_reports.append("Fundamentals Analysis")
-            if state["current_reports"].get("macro_report"):
+            if state.current_reports.get("macro_report"):
                 available_reports.append("Macro Analysis")
-            if state["current_reports"].get("research_manager_report"):
+            if state.current_reports.get("research_manager_report"):
                 available_reports.append("Research Manager Decision")
-            if state["current_reports"].get("trader_investment_plan"):
+            if state.current_reports.get("trader_investment_plan"):
                 available_reports.append("Trader Investment Plan")
-            if state.get("risk_debate_state", {}).get("history"):
+            if (state.risk_debate_state or {}).get("history"):
                 available_reports.append("Risk Debate")
             if final_report_content is not None:
                 available_reports.append("Portfolio Manager Final Decision")
             
             if available_reports:
-                decision_text = f"## Partial Analysis for {state['ticker_symbol']}\n\n"
+                decision_text = f"## Partial Analysis for {state.ticker_symbol}\n\n"
                 decision_text += "**Completed Reports:** " + ", ".join(available_reports) + "\n\n"
                 
                 # Show the latest available decision as "Current Decision"
                 risk_debate_latest = ""
-                if state.get("risk_debate_state", {}).get("history"):
+                if (state.risk_debate_state or {}).get("history"):
                     # Get the last message from risk debate
-                    risk_history = state["risk_debate_state"]["history"]
+                    risk_history = state.risk_debate_state["history"]
                     if risk_history:
                         risk_debate_latest = risk_history.split('\n')[-1] if risk_history else ""
                 
                 current_decision = (
                     final_report_content or
                     risk_debate_latest or
-                    state["current_reports"].get("trader_investment_plan") or
-                    state["current_reports"].get("research_manager_report")
+                    state.current_reports.get("trader_investment_plan") or
+                    state.current_reports.get("research_manager_report")
                 )
                 
                 if current_decision:
@@ -41,6 +41,7 @@ def register_status_callbacks(app):
         ]
         
         # Create table rows
+        agent_statuses = current_state.statuses_as_dict()
         rows = []
         team_order = ["Analyst Team", "Research Team", "Trading Team", "Risk Management"]
         for team_name in team_order:
@@ -49,7 +50,7 @@ def register_status_callbacks(app):
                 continue
             
             for agent in agents:
-                status = current_state["agent_statuses"].get(agent, "pending")
+                status = agent_statuses.get(agent, "pending")
                 
                 # Set status icon and color
                 if status == "completed":
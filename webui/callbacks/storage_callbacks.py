@@ -3,7 +3,7 @@ Storage callbacks for persisting user settings in localStorage
 """
 
 from dash import Input, Output, State, callback_context as ctx
-from webui.utils.storage import get_default_settings
+from webui.utils.storage import get_default_settings, get_default_settings_view
 
 def register_storage_callbacks(app):
     """Register storage-related callbacks"""
@@ -32,7 +32,7 @@ def register_storage_callbacks(app):
         """Load settings from localStorage store"""
         if not stored_settings:
             # Return default settings if nothing stored
-            defaults = get_default_settings()
+            defaults = get_default_settings_view()
             return [
                 defaults["ticker_input"],
                 defaults["analyst_market"],
@@ -22,20 +22,20 @@ def execute_trade_after_analysis(ticker, allow_shorts, trade_amount):
             print(f"[TRADE] No state found for {ticker}, skipping trade execution")
             return
             
-        if not state.get("analysis_complete"):
+        if not state.analysis_complete:
             print(f"[TRADE] Analysis not complete for {ticker}, skipping trade execution")
-            print(f"[TRADE] Analysis status: {state.get('analysis_complete', 'Unknown')}")
+            print(f"[TRADE] Analysis status: {state.analysis_complete}")
             return
         
         print(f"[TRADE] Analysis complete for {ticker}, checking for recommended action")
         
         # Get the recommended action
-        recommended_action = state.get("recommended_action")
+        recommended_action = state.recommended_action
         print(f"[TRADE] Direct recommended_action: {recommended_action}")
         
         if not recommended_action:
             # Try to extract from final trade decision
-            final_decision = state["current_reports"].get("final_trade_decision")
+            final_decision = state.current_reports.get("final_trade_decision")
             print(f"[TRADE] Final decision available: {bool(final_decision)}")
             if final_decision:
                 trading_mode = "trading" if allow_shorts else "investment"
@@ -45,7 +45,7 @@ def execute_trade_after_analysis(ticker, allow_shorts, trade_amount):
         
         if not recommended_action:
             print(f"[TRADE] No recommended action found for {ticker}, skipping trade execution")
-            print(f"[TRADE] Available reports: {list(state['current_reports'].keys())}")
+            print(f"[TRADE] Available reports: {list(state.current_reports.keys())}")
             return
         
         print(f"[TRADE] Executing trade for {ticker}: {recommended_action} with ${trade_amount}")
@@ -84,7 +84,7 @@ def execute_trade_after_analysis(ticker, allow_shorts, trade_amount):
                 print(f"[TRADE] {success}")
             
             # Store trading results in state for UI display
-            state["trading_results"] = result
+            state.trading_results = result
             
             # Signal that a trade occurred to trigger Alpaca data refresh
             app_state.signal_trade_occurred()
@@ -96,7 +96,7 @@ def execute_trade_after_analysis(ticker, allow_shorts, trade_amount):
                 print(f"[TRADE] {failure}")
             
             # Store error information
-            state["trading_results"] = {"error": "One or more trading actions failed", "details": failed_actions}
+            state.trading_results = {"error": "One or more trading actions failed", "details": failed_actions}
             
     except Exception as e:
         print(f"[TRADE] Error executing trade for {ticker}: {e}")
@@ -104,7 +104,7 @@ def execute_trade_after_analysis(ticker, allow_shorts, trade_amount):
         traceback.print_exc()
         state = app_state.get_state(ticker)
         if state:
-            state["trading_results"] = {"error": f"Trading execution error: {str(e)}"}
+            state.trading_results = {"error": f"Trading execution error: {str(e)}"}
 
 
 def run_analysis(ticker, selected_analysts, research_depth_config, allow_shorts, quick_llm, deep_llm, progress=None):
@@ -124,8 +124,8 @@ def run_analysis(ticker, selected_analysts, research_depth_config, allow_shorts,
         if not current_state:
             print(f"Error: No state found for {ticker}")
             return
-        current_state["analysis_running"] = True
-        current_state["analysis_complete"] = False
+        current_state.analysis_running = True
+        app_state.set_analysis_complete(ticker, False)
         
         # Handle both new dict format and legacy integer format
         if isinstance(research_depth_config, dict):
@@ -175,8 +175,9 @@ def run_analysis(ticker, selected_analysts, research_depth_config, allow_shorts,
             # Update progress bar if provided
             if progress is not None:
                 # Simulate progress based on steps completed
-                completed_agents = sum(1 for status in current_state["agent_statuses"].values() if status == "completed")
-                total_agents = len(current_state["agent_statuses"])
+                agent_statuses = current_state.statuses_as_dict()
+                completed_agents = sum(1 for status in agent_statuses.values() if status == "completed")
+                total_agents = len(agent_statuses)
                 if total_agents > 0:
                     progress(completed_agents / total_agents)
             
@@ -188,14 +189,14 @@ def run_analysis(ticker, selected_analysts, research_depth_config, allow_shorts,
         decision = graph.process_signal(final_state["final_trade_decision"])
         
         # NEW: Persist the extracted decision so the trading engine can act on it directly
-        current_state["recommended_action"] = decision
+        current_state.recommended_action = decision
 
         # Mark all agents as completed
-        for agent in current_state["agent_statuses"]:
+        for agent in current_state.agent_statuses:
             app_state.update_agent_status(agent, "completed")
         
         # Set final results
-        current_state["analysis_results"] = {
+        current_state.analysis_results = {
             "ticker": ticker,
             "date": current_date,
             "decision": decision,
@@ -203,9 +204,9 @@ def run_analysis(ticker, selected_analysts, research_depth_config, allow_shorts,
         }
         
         # Use real chart data with current date (no end_date means most recent data)
-        current_state["chart_data"] = create_chart(ticker, period="1y", end_date=None)
+        current_state.chart_data = create_chart(ticker, period="1y", end_date=None)
         
-        current_state["analysis_complete"] = True
+        app_state.set_analysis_complete(ticker)
         
         # Execute trade if enabled
         trade_enabled = getattr(app_state, 'trade_enabled', False)
@@ -233,7 +234,7 @@ def run_analysis(ticker, selected_analysts, research_depth_config, allow_shorts,
     finally:
         # Mark analysis as no longer running
         print(f"Real-time analysis for {ticker} completed")
-        current_state["analysis_running"] = False
+        current_state.analysis_running = False
         
     return "Real-time analysis complete"
 
@@ -275,7 +276,7 @@ def start_analysis(ticker, analysts_market, analysts_social, analysts_news, anal
         print(f"Creating initial chart for {ticker} with current market data")
         current_state = app_state.get_state(ticker)
         if current_state:
-            current_state["chart_data"] = create_chart(ticker, period="1y", end_date=None)
+            current_state.chart_data = create_chart(ticker, period="1y", end_date=None)
     except Exception as e:
         print(f"Error creating initial chart: {e}")
         import traceback
@@ -2,12 +2,48 @@
 webui/components/ui.py
 """
 
+import html as html_module
 from datetime import datetime
+from functools import lru_cache
 from webui.utils.state import app_state
 from webui.utils.charts import create_chart, create_welcome_chart
 import time
 
 
+# Single-pass equivalent of html.escape(text).replace("\n", "<br>")
+_ESCAPE_MAP = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+    "\n": "<br>",
+})
+
+# Risk debate message markup; only the index, speaker class, author label and content vary
+_RISK_MESSAGE_TMPL = (
+    '<div class="message-row" data-message-index="{i}">'
+    '<div class="message {cls}">'
+    '<div class="message-author">{author}</div>'
+    '<div class="message-content">{content}</div>'
+    '</div></div>'
+)
+
+# Speaker headers used in the risk debate history, mapped to speaker keys
+_RISK_HEADERS = (
+    ("Risky Analyst:", "risky"),
+    ("Safe Analyst:", "safe"),
+    ("Neutral Analyst:", "neutral"),
+)
+_RISK_HEADER_PREFIXES = tuple(header for header, _ in _RISK_HEADERS)
+
+_RISK_SPEAKER_META = {
+    "risky": ("risky-message", "💰 Risk Analyst (Aggressive)"),
+    "safe": ("safe-message", "🛡️ Safe Analyst (Conservative)"),
+    "neutral": ("neutral-message", "⚖️ Neutral Analyst (Balanced)"),
+}
+
+
 def render_researcher_debate(symbol):
     """Render the Bull and Bear Researcher debate as a chat-like interface"""
     if not symbol:
@@ -19,7 +55,7 @@ def render_researcher_debate(symbol):
         return f"<p>No active analysis for {symbol}. Researcher debate will appear here once analysis starts.</p>"
 
     # Get the debate history from the stored investment_debate_state
-    debate_state = state.get("investment_debate_state")
+    debate_state = state.investment_debate_state
     debate_history = ""
     
     if debate_state and "history" in debate_state:
@@ -66,26 +102,29 @@ def render_researcher_debate(symbol):
                 # Legacy format
                 parts = re.split(r'(Bull Analyst:|Bear Analyst:)', debate_history)
                 current_speaker = None
-                current_message = ""
+                current_message = []  # Buffer parts and join once per message
+                
+                def flush_message():
+                    if current_speaker and current_message:
+                        text = "".join(current_message).strip()
+                        if text:
+                            messages.append((current_speaker, text))
                 
                 for part in parts:
                     part = part.strip()
                     if part == "Bull Analyst:":
-                        if current_speaker and current_message.strip():
-                            messages.append((current_speaker, current_message.strip()))
+                        flush_message()
                         current_speaker = "bull"
-                        current_message = ""
+                        current_message = []
                     elif part == "Bear Analyst:":
-                        if current_speaker and current_message.strip():
-                            messages.append((current_speaker, current_message.strip()))
+                        flush_message()
                         current_speaker = "bear"
-                        current_message = ""
+                        current_message = []
                     elif part and current_speaker:
-                        current_message += part
+                        current_message.append(part)
                 
                 # Add the last message
-                if current_speaker and current_message.strip():
-                    messages.append((current_speaker, current_message.strip()))
+                flush_message()
             else:
                 # Fallback - treat as single message 
                 # Try to detect if it's bull or bear based on content
@@ -480,12 +519,8 @@ def render_researcher_debate(symbol):
         html += f'<div class="no-messages">Researcher debate for {symbol} will appear here once analysis starts.<br>The debate will show alternating messages between Bull and Bear researchers.</div>'
     else:
         for i, (speaker, content) in enumerate(messages):
-            # Properly escape HTML in content and ensure reasonable length
-            import html as html_module
-            escaped_content = html_module.escape(content)
-            
-            # Add line breaks for better readability
-            escaped_content = escaped_content.replace('\n', '<br>')
+            # Escape HTML in content and add line breaks for better readability
+            escaped_content = content.translate(_ESCAPE_MAP)
             
             if speaker == "bull":
                 html += f"""
@@ -531,7 +566,7 @@ def render_agent_status_table():
     if not current_state:
         return "<p>No analysis running</p>"
     
-    statuses = current_state["agent_statuses"]
+    statuses = current_state.agent_statuses
     html = "<table><tr><th>Agent</th><th>Status</th></tr>"
     for agent, status in statuses.items():
         status_icon = "✅" if status == "completed" else "🔄" if status == "in_progress" else "⏸️"
@@ -643,31 +678,14 @@ def update_chart_period(period, analysis_date=None):
     # If no ticker, return welcome chart
     return create_welcome_chart()
 
-def render_risk_debate(symbol):
-    """Render the Risk, Safe, and Neutral debators debate as a chat-like interface"""
-    if not symbol:
-        return "<p></p>"
-        
-    state = app_state.get_state(symbol)
-
-    if not state:
-        return f"<p>No active analysis for {symbol}. Risk debator discussion will appear here once analysis starts.</p>"
-
-    # Get the debate history from the stored risk_debate_state
-    debate_state = state.get("risk_debate_state")
-    debate_history = ""
-    
-    if debate_state and "history" in debate_state:
-        debate_history = debate_state["history"]
-
-    # Parse the debate history into individual messages
+def _parse_risk_debate_messages(debate_history):
+    """Split a risk debate history string into (speaker, content) tuples"""
     messages = []
     if debate_history:
         import re
-        import html
         
         # Clean up any HTML escaping that might be present
-        debate_history = html.unescape(debate_history)
+        debate_history = html_module.unescape(debate_history)
         
         # Clean up the content
         debate_history = debate_history.replace('\r\n', '\n').replace('\r', '\n')
@@ -680,61 +698,60 @@ def render_risk_debate(symbol):
             if not section:
                 continue
                 
-            # Determine the speaker and extract content
-            if section.startswith('Risky Analyst:'):
-                # Risky section
-                content = section[13:].strip()  # Remove "Risky Analyst:" prefix
-                if content:
-                    messages.append(("risky", content))
-                    
-            elif section.startswith('Safe Analyst:'):
-                # Safe section  
-                content = section[13:].strip()  # Remove "Safe Analyst:" prefix
-                if content:
-                    messages.append(("safe", content))
-                    
-            elif section.startswith('Neutral Analyst:'):
-                # Neutral section
-                content = section[16:].strip()  # Remove "Neutral Analyst:" prefix
-                if content:
-                    messages.append(("neutral", content))
+            # Determine the speaker and extract content without the header
+            for header, speaker in _RISK_HEADERS:
+                if section.startswith(header):
+                    content = section[len(header):].strip()
+                    if content:
+                        messages.append((speaker, content))
+                    break
         
         # If no messages were parsed and we have content, try to detect the format
         if not messages and debate_history.strip():
             # Try to parse line by line for cases where headers appear mid-text
-            lines = debate_history.split('\n')
+            lines = [line.strip() for line in debate_history.split('\n')]
+            
+            # Every message starts on a header line, so this bounds the message count
+            messages = [None] * sum(1 for line in lines if line.startswith(_RISK_HEADER_PREFIXES))
+            count = 0
             current_speaker = None
-            current_message = ""
+            segment_start = 0
             
-            for line in lines:
-                line = line.strip()
-                if line.startswith("Risky Analyst:"):
-                    if current_speaker and current_message.strip():
-                        messages.append((current_speaker, current_message.strip()))
-                    current_speaker = "risky"
-                    current_message = line[13:].strip()
-                elif line.startswith("Safe Analyst:"):
-                    if current_speaker and current_message.strip():
-                        messages.append((current_speaker, current_message.strip()))
-                    current_speaker = "safe"
-                    current_message = line[13:].strip()
-                elif line.startswith("Neutral Analyst:"):
-                    if current_speaker and current_message.strip():
-                        messages.append((current_speaker, current_message.strip()))
-                    current_speaker = "neutral"
-                    current_message = line[16:].strip()
-                elif current_speaker:
-                    if current_message:
-                        current_message += "\n" + line
-                    else:
-                        current_message = line
+            for idx, line in enumerate(lines):
+                for header, speaker in _RISK_HEADERS:
+                    if line.startswith(header):
+                        break
+                else:
+                    continue
+                
+                # Flush the previous segment, stripping it once as a whole
+                if current_speaker:
+                    content = "\n".join(lines[segment_start:idx]).strip()
+                    if content:
+                        messages[count] = (current_speaker, content)
+                        count += 1
+                
+                lines[idx] = line[len(header):]
+                current_speaker = speaker
+                segment_start = idx
             
             # Add the last message
-            if current_speaker and current_message.strip():
-                messages.append((current_speaker, current_message.strip()))
+            if current_speaker:
+                content = "\n".join(lines[segment_start:]).strip()
+                if content:
+                    messages[count] = (current_speaker, content)
+                    count += 1
+            
+            del messages[count:]
 
-    # Create a complete HTML document for the iframe with improved smooth scrolling
-    html = f"""
+    return messages
+
+
+@lru_cache(maxsize=32)
+def create_risk_debate_shell(symbol):
+    """Build the static part of the risk debate iframe document (cached per symbol)"""
+    # Static document head, styles and script; messages are appended after this
+    return f"""
     <!DOCTYPE html>
     <html>
     <head>
@@ -781,6 +798,9 @@ def render_risk_debate(symbol):
                 opacity: 1;
                 transform: translateY(0);
                 transition: all 0.3s ease-in-out;
+                /* Skip style/layout/paint for rows scrolled out of view */
+                content-visibility: auto;
+                contain-intrinsic-size: auto 120px;
             }}
             .message-row.new-message {{
                 animation: slideInMessage 0.4s ease-out;
@@ -796,6 +816,7 @@ def render_risk_debate(symbol):
                 }}
             }}
             .message {{
+                position: relative;
                 max-width: 75%;
                 padding: 12px 16px;
                 border-radius: 18px;
@@ -803,11 +824,24 @@ def render_risk_debate(symbol):
                 white-space: pre-wrap;
                 word-wrap: break-word;
                 box-shadow: 0 2px 8px rgba(0, 0, 0, 0.15);
-                transition: transform 0.2s ease, box-shadow 0.2s ease;
+                transition: transform 0.2s ease;
+            }}
+            /* Hover shadow lives on a pseudo-element so only opacity/transform animate */
+            .message::after {{
+                content: '';
+                position: absolute;
+                inset: 0;
+                border-radius: inherit;
+                box-shadow: 0 4px 12px rgba(0, 0, 0, 0.2);
+                opacity: 0;
+                transition: opacity 0.2s ease;
+                pointer-events: none;
             }}
             .message:hover {{
                 transform: translateY(-1px);
-                box-shadow: 0 4px 12px rgba(0, 0, 0, 0.2);
+            }}
+            .message:hover::after {{
+                opacity: 1;
             }}
             .risky-message {{
                 background: linear-gradient(135deg, #DC2626, #B91C1C);
@@ -907,10 +941,9 @@ def render_risk_debate(symbol):
             let isUserAtBottom = true;
             let isInitialized = false;
             
-            // Storage keys for handling page refreshes only
-            const SCROLL_KEY = 'risk_debate_scroll_{symbol}';
-            const BOTTOM_KEY = 'risk_debate_bottom_{symbol}';
-            const COUNT_KEY = 'risk_debate_count_{symbol}';
+            // Single storage key for handling page refreshes only
+            const STATE_KEY = 'risk_debate_state_{symbol}';
+            let pendingSave = false;
             
             function isAtBottom(container) {{
                 const threshold = 30; // More forgiving threshold
@@ -921,20 +954,39 @@ def render_risk_debate(symbol):
                 container.scrollTop = container.scrollHeight;
             }}
             
+            function doSave(container) {{
+                localStorage.setItem(STATE_KEY, JSON.stringify({{
+                    s: container.scrollTop,
+                    b: isAtBottom(container),
+                    c: lastMessageCount
+                }}));
+            }}
+            
             function saveScrollState(container) {{
-                // Only save state when user manually scrolls or when content updates
-                localStorage.setItem(SCROLL_KEY, container.scrollTop);
-                localStorage.setItem(BOTTOM_KEY, isAtBottom(container));
-                localStorage.setItem(COUNT_KEY, document.querySelectorAll('.message-row').length);
+                // Coalesce bursty writes into at most one localStorage write per frame
+                if (pendingSave) return;
+                pendingSave = true;
+                requestAnimationFrame(() => {{
+                    pendingSave = false;
+                    doSave(container);
+                }});
+            }}
+            
+            function loadScrollState() {{
+                try {{
+                    return JSON.parse(localStorage.getItem(STATE_KEY));
+                }} catch (e) {{
+                    return null;
+                }}
             }}
             
             function restoreScrollPosition(container) {{
-                const savedScroll = localStorage.getItem(SCROLL_KEY);
-                const savedBottom = localStorage.getItem(BOTTOM_KEY) === 'true';
-                const savedCount = parseInt(localStorage.getItem(COUNT_KEY) || '0');
+                const saved = loadScrollState();
                 const currentCount = document.querySelectorAll('.message-row').length;
                 
-                if (savedScroll !== null) {{
+                if (saved) {{
+                    const savedBottom = saved.b === true;
+                    const savedCount = saved.c || 0;
                     if (savedBottom && currentCount > savedCount) {{
                         // Was at bottom and new messages arrived, scroll to bottom
                         scrollToBottom(container, false);
@@ -945,7 +997,7 @@ def render_risk_debate(symbol):
                         isUserAtBottom = true;
                     }} else {{
                         // Was not at bottom, restore exact position
-                        container.scrollTop = parseInt(savedScroll);
+                        container.scrollTop = saved.s || 0;
                         isUserAtBottom = false;
                     }}
                 }} else if (currentCount > 0) {{
@@ -992,11 +1044,8 @@ def render_risk_debate(symbol):
                     const allMessages = document.querySelectorAll('.message-row');
                     for (let i = lastMessageCount; i < currentMessageCount; i++) {{
                         if (allMessages[i]) {{
+                            // Removed by the container's animationend listener
                             allMessages[i].classList.add('new-message');
-                            // Remove animation class after animation completes
-                            setTimeout(() => {{
-                                allMessages[i].classList.remove('new-message');
-                            }}, 400);
                         }}
                     }}
                     
@@ -1038,23 +1087,29 @@ def render_risk_debate(symbol):
                 }};
                 document.body.appendChild(scrollButton);
                 
-                // Handle scroll events - track user's position
-                let scrollTimeout;
+                // Remove the animation class once the slide-in actually finishes
+                container.addEventListener('animationend', function(event) {{
+                    if (event.animationName === 'slideInMessage') {{
+                        event.target.classList.remove('new-message');
+                    }}
+                }});
+                
+                // Handle scroll events - track user's position, at most once per frame
+                let ticking = false;
                 container.addEventListener('scroll', function() {{
-                    // Clear previous timeout
-                    clearTimeout(scrollTimeout);
-                    
-                    // Debounce scroll position updates to avoid too frequent checks
-                    scrollTimeout = setTimeout(() => {{
+                    if (ticking) return;
+                    ticking = true;
+                    requestAnimationFrame(() => {{
+                        ticking = false;
                         isUserAtBottom = isAtBottom(container);
                         updateScrollButton(container);
                         saveScrollState(container);
-                    }}, 100);
-                }});
+                    }});
+                }}, {{ passive: true }});
                 
                 // Save state before page unload/refresh
                 window.addEventListener('beforeunload', function() {{
-                    saveScrollState(container);
+                    doSave(container);
                 }});
                 
                 // Initial setup
@@ -1076,46 +1131,48 @@ def render_risk_debate(symbol):
     <body>
         <div class="debate-container" id="debate-container">
     """
+
+
+def _render_risk_message(i, speaker, content):
+    """Render a single risk debate message row"""
+    # Escape HTML in content and add line breaks for better readability
+    escaped_content = content.translate(_ESCAPE_MAP)
+    cls, author = _RISK_SPEAKER_META[speaker]
+    return _RISK_MESSAGE_TMPL.format(i=i, cls=cls, author=author, content=escaped_content)
+
+
+def render_risk_debate(symbol):
+    """Render the Risk, Safe, and Neutral debators debate as a chat-like interface"""
+    if not symbol:
+        return "<p></p>"
+        
+    state = app_state.get_state(symbol)
+
+    if not state:
+        return f"<p>No active analysis for {symbol}. Risk debator discussion will appear here once analysis starts.</p>"
+
+    # Get the debate history from the stored risk_debate_state
+    debate_state = state.risk_debate_state
+    debate_history = ""
+    
+    if debate_state and "history" in debate_state:
+        debate_history = debate_state["history"]
+
+    return _render_risk_debate_document(symbol, debate_history)
+
+
+@lru_cache(maxsize=16)
+def _render_risk_debate_document(symbol, debate_history):
+    """Build the full risk debate document; cached so unchanged history skips parsing and rendering"""
+    messages = _parse_risk_debate_messages(debate_history)
+
+    html = create_risk_debate_shell(symbol)
     
     # Add messages to HTML
     if not messages:
         html += f'<div class="no-messages">Risk debator discussion for {symbol} will appear here once analysis starts.<br>The discussion will show messages between Risk (red, left), Safe (green, left), and Neutral (blue, right) analysts.</div>'
     else:
-        for i, (speaker, content) in enumerate(messages):
-            # Properly escape HTML in content and ensure reasonable length
-            import html as html_module
-            escaped_content = html_module.escape(content)
-            
-            # Add line breaks for better readability
-            escaped_content = escaped_content.replace('\n', '<br>')
-            
-            if speaker == "risky":
-                html += f"""
-                    <div class="message-row" data-message-index="{i}">
-                        <div class="message risky-message">
-                            <div class="message-author">💰 Risk Analyst (Aggressive)</div>
-                            <div class="message-content">{escaped_content}</div>
-                        </div>
-                    </div>
-                """
-            elif speaker == "safe":
-                html += f"""
-                    <div class="message-row" data-message-index="{i}">
-                        <div class="message safe-message">
-                            <div class="message-author">🛡️ Safe Analyst (Conservative)</div>
-                            <div class="message-content">{escaped_content}</div>
-                        </div>
-                    </div>
-                """
-            else:  # neutral
-                html += f"""
-                    <div class="message-row" data-message-index="{i}">
-                        <div class="message neutral-message">
-                            <div class="message-author">⚖️ Neutral Analyst (Balanced)</div>
-                            <div class="message-content">{escaped_content}</div>
-                        </div>
-                    </div>
-                """
+        html += "".join(_render_risk_message(i, speaker, content) for i, (speaker, content) in enumerate(messages))
     
     html += """
         </div>
@@ -1123,4 +1180,4 @@ def render_risk_debate(symbol):
     </html>
     """
     
-    return html 
\ No newline at end of file
+    return html 
@@ -3,6 +3,8 @@ Layout module for TradingAgents WebUI
 Organizes the main application layout and component assembly
 """
 
+from functools import lru_cache
+
 from dash import dcc, html
 import dash_bootstrap_components as dbc
 
@@ -15,6 +17,19 @@ from webui.components.reports_panel import create_reports_panel
 from webui.components.alpaca_account import render_alpaca_account_section
 from webui.components.api_config_modal import create_api_config_modal
 from webui.config.constants import COLORS, REFRESH_INTERVALS
+from webui.utils.storage import create_storage_store_component, create_api_keys_store_component
+
+
+# The panel factories take no arguments and build static component trees,
+# so build each one once and reuse it if the layout is recreated. The Alpaca
+# account section is not cached since it fetches live account data.
+_header = lru_cache(maxsize=1)(create_header)
+_config_panel = lru_cache(maxsize=1)(create_config_panel)
+_status_panel = lru_cache(maxsize=1)(create_status_panel)
+_chart_panel = lru_cache(maxsize=1)(create_chart_panel)
+_decision_panel = lru_cache(maxsize=1)(create_decision_panel)
+_reports_panel = lru_cache(maxsize=1)(create_reports_panel)
+_api_config_modal = lru_cache(maxsize=1)(create_api_config_modal)
 
 
 def create_intervals():
@@ -48,7 +63,6 @@ def create_intervals():
 
 def create_stores():
     """Create store components for state management"""
-    from webui.utils.storage import create_storage_store_component, create_api_keys_store_component
     return [
         dcc.Store(id='app-store'),
         dcc.Store(id='chart-store', data={'last_symbol': None, 'selected_period': '1y'}),
@@ -80,12 +94,12 @@ def create_main_layout():
     """Create the main application layout"""
     
     # Create UI components
-    header = create_header()
-    config_card = create_config_panel()
-    status_card = create_status_panel()
-    chart_card = create_chart_panel()
-    decision_card = create_decision_panel()
-    reports_card = create_reports_panel()
+    header = _header()
+    config_card = _config_panel()
+    status_card = _status_panel()
+    chart_card = _chart_panel()
+    decision_card = _decision_panel()
+    reports_card = _reports_panel()
     
     # Create Alpaca account card
     alpaca_account_card = dbc.Card(
@@ -96,7 +110,7 @@ def create_main_layout():
     )
     
     # Create API config modal
-    api_config_modal = create_api_config_modal()
+    api_config_modal = _api_config_modal()
     
     # Assemble the layout
     layout = dbc.Container(
@@ -108,60 +122,6 @@ def create_main_layout():
             # API Configuration Modal
             api_config_modal,
             
-            # Client-side script to handle iframe messages for prompt modal
-            html.Script("""
-                window.addEventListener('message', function(event) {
-                    if (event.data && event.data.type === 'showPrompt') {
-                        // Find and trigger the appropriate show prompt button
-                        const buttons = document.querySelectorAll('[id*="show-prompt-"]');
-                        const reportType = event.data.reportType;
-                        
-                        // Find the button that matches this report type
-                        let targetButton = null;
-                        for (let button of buttons) {
-                            const buttonId = button.getAttribute('id');
-                            if (buttonId && buttonId.includes(reportType)) {
-                                targetButton = button;
-                                break;
-                            }
-                        }
-                        
-                        // If no direct match, try pattern matching
-                        if (!targetButton) {
-                            for (let button of buttons) {
-                                const buttonData = button.getAttribute('data-dash-props');
-                                if (buttonData && buttonData.includes(reportType)) {
-                                    targetButton = button;
-                                    break;
-                                }
-                            }
-                        }
-                        
-                        // Trigger the button click if found
-                        if (targetButton) {
-                            targetButton.click();
-                        } else {
-                            console.log('Could not find button for:', reportType);
-                            // Fallback: trigger any show prompt button and set content manually
-                            const anyPromptBtn = document.querySelector('[id*="show-prompt-"]');
-                            if (anyPromptBtn) {
-                                anyPromptBtn.click();
-                                // Try to set the modal content directly after a short delay
-                                setTimeout(() => {
-                                    const modalTitle = document.querySelector('#prompt-modal-title');
-                                    const modalContent = document.querySelector('#prompt-modal-content');
-                                    if (modalTitle) modalTitle.textContent = event.data.title;
-                                    if (modalContent) {
-                                        // This will be filled by the callback, but we can try to trigger it
-                                        console.log('Showing prompt for:', reportType);
-                                    }
-                                }, 100);
-                            }
-                        }
-                    }
-                });
-            """),
-            
             # Main content
             header,
             alpaca_account_card,
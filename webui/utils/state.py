@@ -2,48 +2,343 @@
 Trading Agents Framework - State Management
 """
 
+import array
+import collections
+import functools
+import itertools
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Agent names used as keys on the chunk path; interned so repeated lookups hit identity checks
+_MACRO = sys.intern("Macro Analyst")
+_BULL = sys.intern("Bull Researcher")
+_BEAR = sys.intern("Bear Researcher")
+_RESEARCH_MGR = sys.intern("Research Manager")
+_TRADER = sys.intern("Trader")
+_RISKY = sys.intern("Risky Analyst")
+_SAFE = sys.intern("Safe Analyst")
+_NEUTRAL = sys.intern("Neutral Analyst")
+_PORTFOLIO = sys.intern("Portfolio Manager")
+
+# Agent statuses are stored per symbol as one small int per agent, indexed by AGENT_INDEX
+_AGENT_NAMES = tuple(sys.intern(agent) for agent in (
+    "Market Analyst",
+    "Social Analyst",
+    "News Analyst",
+    "Fundamentals Analyst",
+    "Macro Analyst",
+    "Bull Researcher",
+    "Bear Researcher",
+    "Research Manager",
+    "Trader",
+    "Risky Analyst",
+    "Safe Analyst",
+    "Neutral Analyst",
+    "Portfolio Manager"
+))
+AGENT_INDEX = {agent: index for index, agent in enumerate(_AGENT_NAMES)}
+
+STATUS_PENDING = 0
+STATUS_IN_PROGRESS = 1
+STATUS_COMPLETED = 2
+_STATUS_NAMES = ("pending", "in_progress", "completed")
+_STATUS_CODES = {name: code for code, name in enumerate(_STATUS_NAMES)}
+
+# Per-symbol defaults; copied for each symbol so the templates are never mutated
+_AGENT_STATUSES_TEMPLATE = array.array("b", [STATUS_PENDING] * len(_AGENT_NAMES))
+
+# Report slots, filled in per symbol as the agents deliver them
+_REPORTS_TEMPLATE = {
+    "market_report": None,
+    "sentiment_report": None,
+    "news_report": None,
+    "fundamentals_report": None,
+    "macro_report": None,
+    "bull_report": None,
+    "bear_report": None,
+    "research_manager_report": None,
+    "investment_plan": None,
+    "trader_investment_plan": None,
+    "risky_report": None,
+    "safe_report": None,
+    "neutral_report": None,
+    "portfolio_decision": None,
+    "final_trade_decision": None
+}
+
+# Ring buffer sizes for the activity logs; only recent entries are displayed, and the
+# counters are tracked separately so they are not capped
+_TOOL_CALLS_LOG_MAXLEN = 5000
+_LLM_CALLS_LOG_MAXLEN = 5000
+_ANALYSIS_TRACE_MAXLEN = 20000
+
+# Regions of the state touched by a processed chunk; any set bit raises needs_ui_update once
+DIRTY_ANALYSTS = 1 << 0
+DIRTY_DEBATE = 1 << 1
+DIRTY_TRADER = 1 << 2
+DIRTY_RISK = 1 << 3
+DIRTY_MESSAGES = 1 << 4
+
+# Researcher debate sides: (fingerprint key, history field, messages field, agent, report key)
+_RESEARCHER_BRANCHES = (
+    ("bull", "bull_history", "bull_messages", _BULL, "bull_report"),
+    ("bear", "bear_history", "bear_messages", _BEAR, "bear_report"),
+)
+
+# Risk debate sides: (fingerprint key, response field, history field, speaker label, agent, report key)
+_RISK_BRANCHES = (
+    ("risky", "current_risky_response", "risky_history", "Risky Analyst: ", _RISKY, "risky_report"),
+    ("safe", "current_safe_response", "safe_history", "Safe Analyst: ", _SAFE, "safe_report"),
+    ("neutral", "current_neutral_response", "neutral_history", "Neutral Analyst: ", _NEUTRAL, "neutral_report"),
+)
+
+# Map report types to agent names
+_REPORT_TO_AGENT = {
+    "market_report": "Market Analyst",
+    "sentiment_report": "Social Analyst",
+    "news_report": "News Analyst",
+    "fundamentals_report": "Fundamentals Analyst",
+    "macro_report": "Macro Analyst",
+    "bull_report": "Bull Researcher",
+    "bear_report": "Bear Researcher",
+    "research_manager_report": "Research Manager",
+    "investment_plan": "Trader",
+    "trader_investment_plan": "Trader",
+    "risky_report": "Risky Analyst",
+    "safe_report": "Safe Analyst",
+    "neutral_report": "Neutral Analyst",
+}
+
+# Default analyst execution order
+_DEFAULT_ANALYST_SEQUENCE = (
+    "Market Analyst",
+    "Social Analyst",
+    "News Analyst",
+    "Fundamentals Analyst",
+    "Macro Analyst",
+)
+
+
+# Analyst report types in workflow order, plus a set for cheap chunk intersection
+_ANALYST_REPORT_ORDER = ("market_report", "sentiment_report", "news_report", "fundamentals_report", "macro_report")
+_ANALYST_REPORT_TYPES = frozenset(_ANALYST_REPORT_ORDER)
+
+# Chunk keys that process_chunk_updates acts on; chunks with none of them are skipped outright
+_RELEVANT_CHUNK_KEYS = _ANALYST_REPORT_TYPES | {
+    "investment_debate_state", "trader_investment_plan", "risk_debate_state", "messages"
+}
+
+# Mapping of report types to agent names, used when filtering tool calls
+_AGENT_MAPPINGS = {k: tuple(v) for k, v in {
+    "market_report": ["market analyst", "market", "technical analyst"],
+    "sentiment_report": ["social analyst", "social", "sentiment analyst"],
+    "news_report": ["news analyst", "news"],
+    "fundamentals_report": ["fundamentals analyst", "fundamental analyst", "fundamentals"],
+    "macro_report": ["macro analyst", "macro", "macroeconomic analyst"],
+    "bull_report": ["bull researcher", "bull", "optimistic researcher"],
+    "bear_report": ["bear researcher", "bear", "pessimistic researcher"],
+    "research_manager_report": ["research manager", "manager"],
+    "trader_investment_plan": ["trader", "trading", "portfolio manager"],
+    "final_trade_decision": ["portfolio manager", "final", "decision"]
+}.items()}
+
+
+# Session IDs only need to be distinct for display and tracking; seeding from the
+# clock keeps them from repeating across restarts
+_session_counter = itertools.count(int(time.time()))
+
+
+def _new_session_id():
+    """Return a short session ID (8 hex digits) for a new analysis session."""
+    return f"{next(_session_counter) & 0xFFFFFFFF:08x}"
+
+
+def _normalize_tool_call(call):
+    """Coerce a tool call record into the dict format used by the UI."""
+    if isinstance(call, dict):
+        return call
+    if isinstance(call, tuple) and len(call) >= 3:
+        # Old format - convert to new format
+        timestamp, tool_name, inputs = call[:3]
+        return {
+            "timestamp": timestamp,
+            "tool_name": tool_name,
+            "inputs": inputs,
+            "output": "Output not available (old format)",
+            "execution_time": "Unknown",
+            "status": "completed",
+            "agent_type": "Unknown Agent"  # Old format doesn't have agent info
+        }
+    # Invalid format - create error entry
+    return {
+        "timestamp": "Unknown",
+        "tool_name": "Invalid Entry",
+        "inputs": {},
+        "output": f"Invalid tool call format: {str(call)}",
+        "execution_time": "Unknown",
+        "status": "error",
+        "agent_type": "Unknown Agent"
+    }
+
+
+@functools.lru_cache(maxsize=8)
+def _build_analyst_sequence(active_analysts):
+    """Return the analyst execution sequence for a tuple of selected analysts."""
+    # If the UI has stored the list of active analysts, respect that (and preserve order)
+    if not active_analysts:
+        return _DEFAULT_ANALYST_SEQUENCE
+    # Keep only those analysts that are in the default ordering to avoid typos
+    sequence = tuple(a for a in _DEFAULT_ANALYST_SEQUENCE if a in active_analysts)
+    # Fallback: if somehow none matched (e.g., custom ordering), just use the provided list
+    return sequence or active_analysts
+
+
+def _set_if_changed(d, key, value):
+    """Store value under key unless it is already there; return whether the dict changed."""
+    current = d.get(key)
+    if current is value or (current is not None and current == value):
+        return False
+    d[key] = value
+    return True
+
+
+def _is_nonempty_report(content):
+    """Whether update_reports_count would count this report, without copying large strings."""
+    if content is None:
+        return False
+    if isinstance(content, str):
+        return bool(content) and not content.isspace()
+    return bool(str(content).strip())
+
+
+@dataclass(slots=True)
+class SymbolState:
+    """Analysis state for a single symbol."""
+    ticker_symbol: str
+    session_id: str
+    session_start_time: float
+    status_codes: array.array = field(default_factory=lambda: array.array("b", _AGENT_STATUSES_TEMPLATE))
+    current_reports: Dict[str, Any] = field(default_factory=_REPORTS_TEMPLATE.copy)
+    analysis_running: bool = False
+    analysis_complete: bool = False
+    analysis_results: Any = None
+    chart_data: Any = None
+    chart_period: str = "1y"  # Default chart period
+    investment_debate_state: Any = None
+    risk_debate_state: Any = None
+    recommended_action: Any = None
+    trading_results: Any = None
+    # Created on first write, since symbols are initialized up front for pagination
+    # long before they are analyzed
+    agent_prompts: Optional[Dict[str, str]] = None
+    report_timestamps: Optional[Dict[str, float]] = None  # When each report was last updated
+    report_lengths: Optional[Dict[str, int]] = None  # Cached len() of each stored report
+    nonempty_report_keys: Optional[Set[str]] = None  # Reports counted in generated_reports_count
+    update_counts: Optional[Dict[str, int]] = None  # Analyst report updates, for loop detection
+
+    @property
+    def agent_statuses(self):
+        """Agent statuses keyed by agent name, as a read-only snapshot for the UI.
+
+        Builds a new dict on every read; hot paths should check status_codes directly.
+        """
+        return self.statuses_as_dict()
+
+    def statuses_as_dict(self):
+        """Return the agent statuses as a name -> status string dict."""
+        return {agent: _STATUS_NAMES[code] for agent, code in zip(_AGENT_NAMES, self.status_codes)}
+
+    def reset_analysis(self, session_id, session_start_time):
+        """Clear analysis results for a new loop iteration, reusing the nested containers."""
+        self.analysis_running = False
+        self.analysis_complete = False
+        self.analysis_results = None
+        self.recommended_action = None
+        self.session_id = session_id
+        self.session_start_time = session_start_time
+        # Refill the nested dicts in place rather than allocating new ones
+        self.current_reports.clear()
+        self.current_reports.update(_REPORTS_TEMPLATE)
+        self.status_codes[:] = _AGENT_STATUSES_TEMPLATE
+        for container in (self.agent_prompts, self.report_timestamps, self.report_lengths,
+                          self.nonempty_report_keys, self.update_counts):
+            if container:
+                container.clear()
+
+
 # Global variables for tracking state
 class AppState:
+    # Fixed attribute layout for the app-wide singleton; attributes assigned from outside this
+    # module (e.g. active_analysts, set by the control callbacks) must be listed here too
+    __slots__ = (
+        "_lock", "analysis_queue", "symbol_states", "current_symbol", "analyzing_symbol",
+        "analysis_running", "analysis_trace", "tool_calls_count", "llm_calls_count",
+        "generated_reports_count", "needs_ui_update", "_last_lengths",
+        "current_session_id", "session_start_time", "tool_calls_log",
+        "llm_calls_log", "_llm_call_count", "_reasoning_count", "loop_enabled", "loop_symbols",
+        "loop_config", "loop_interval_minutes", "loop_thread", "stop_loop", "_completed_symbols",
+        "market_hour_enabled", "market_hour_symbols", "market_hour_config", "market_hours",
+        "market_hour_thread", "stop_market_hour", "trade_enabled", "trade_amount",
+        "trade_occurred", "last_trade_time", "alpaca_refresh_needed", "refresh_interval",
+        "analysis_complete", "analysis_results", "ticker_symbol", "chart_data", "chart_period",
+        "session_id", "report_timestamps", "agent_statuses", "current_reports",
+        "investment_debate_state", "recommended_action", "active_analysts",
+    )
+
     def __init__(self):
-        self.analysis_queue = []
+        # Guards state shared between the analysis worker threads and UI callbacks
+        self._lock = threading.RLock()
+        self.analysis_queue = collections.deque()
         self.symbol_states = {}
         self.current_symbol = None  # Symbol displayed in UI
         self.analyzing_symbol = None  # Symbol currently being analyzed (backend)
         self.analysis_running = False
-        self.analysis_trace = []
+        self.analysis_trace = collections.deque(maxlen=_ANALYSIS_TRACE_MAXLEN)
         self.tool_calls_count = 0
         self.llm_calls_count = 0
         self.generated_reports_count = 0
         self.needs_ui_update = False
+        self._last_lengths = {}  # symbol -> size fingerprints of applied chunk fields
         
         # Session tracking
         self.current_session_id = None
         self.session_start_time = None
         
         # New: Proper tracking lists similar to CLI
-        self.tool_calls_log = []  # Store actual tool calls for proper counting
-        self.llm_calls_log = []   # Store actual LLM calls for proper counting
+        self.tool_calls_log = collections.deque(maxlen=_TOOL_CALLS_LOG_MAXLEN)  # Recent tool calls for display
+        self.llm_calls_log = collections.deque(maxlen=_LLM_CALLS_LOG_MAXLEN)    # Recent LLM calls for display
+        self._llm_call_count = 0  # Number of "LLM_CALL" entries appended to llm_calls_log
+        self._reasoning_count = 0  # Number of "Reasoning" entries appended to llm_calls_log
         
         # Loop configuration
         self.loop_enabled = False
-        self.loop_symbols = []
-        self.loop_config = {}
+        self.loop_symbols = []  # Store original symbols list for looping
+        self.loop_config = {}  # Store analysis configuration for looping
         self.loop_interval_minutes = 60  # Default 1 hour
         self.loop_thread = None
-        self.stop_loop = False
+        self.stop_loop = False  # Flag to stop the loop
+        self._completed_symbols = set()  # Symbols whose analysis_complete flag is set
         
-        # Market hour configuration  
+        # Market hour configuration
         self.market_hour_enabled = False
-        self.market_hour_symbols = []
-        self.market_hour_config = {}
-        self.market_hours = []
+        self.market_hour_symbols = []  # Store original symbols list for market hour trading
+        self.market_hour_config = {}  # Store analysis configuration for market hour trading
+        self.market_hours = []  # List of hours to trade (e.g., [10, 15] for 10AM and 3PM)
         self.market_hour_thread = None
-        self.stop_market_hour = False
+        self.stop_market_hour = False  # Flag to stop market hour scheduling
         
         # Trading configuration
         self.trade_enabled = False
         self.trade_amount = 1000
         self.trade_occurred = False
+        self.last_trade_time = None
+        self.alpaca_refresh_needed = False
         
         self.refresh_interval = 1.0  # seconds
         self.analysis_complete = False
@@ -52,68 +347,62 @@ class AppState:
         self.chart_data = None
         self.chart_period = "1y"  # Default chart period
         self.session_id = None
-        self.session_start_time = None
         self.report_timestamps = {}  # Track when each report was last updated
         self.agent_statuses = {}
         self.current_reports = {}
         self.investment_debate_state = None
         self.recommended_action = None
-        self.last_trade_time = None
-        self.alpaca_refresh_needed = False
-        self.loop_enabled = False
-        self.loop_interval_minutes = 60
-        self.loop_symbols = []  # Store original symbols list for looping
-        self.loop_config = {}  # Store analysis configuration for looping
-        self.loop_thread = None
-        self.stop_loop = False  # Flag to stop the loop
-        self.market_hour_enabled = False
-        self.market_hours = []  # List of hours to trade (e.g., [10, 15] for 10AM and 3PM)
-        self.market_hour_symbols = []  # Store original symbols list for market hour trading
-        self.market_hour_config = {}  # Store analysis configuration for market hour trading
-        self.market_hour_thread = None
-        self.stop_market_hour = False  # Flag to stop market hour scheduling
-        self.trade_enabled = False
-        self.trade_amount = 1000
-        self.trade_occurred = False
+        self.active_analysts = []  # Analysts selected in the UI, set when an analysis starts
 
     def register_llm_call(self, model_name=None, purpose=None):
         """Register an LLM call for accurate UI counting."""
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        timestamp = time.strftime("%H:%M:%S")
         payload = {"model": model_name, "purpose": purpose}
-        self.llm_calls_log.append((timestamp, "LLM_CALL", payload))
-        self.llm_calls_count = len([call for call in self.llm_calls_log if call[1] == "LLM_CALL"])
-        self.needs_ui_update = True
+        with self._lock:
+            self.llm_calls_log.append((timestamp, "LLM_CALL", payload))
+            self._llm_call_count += 1
+            self.llm_calls_count = self._llm_call_count
+            self.needs_ui_update = True
+
+    def register_tool_call(self, tool_call_info):
+        """Register a tool call for display and counting, normalized to the dict format."""
+        tool_call_info = _normalize_tool_call(tool_call_info)
+        with self._lock:
+            self.tool_calls_log.append(tool_call_info)
+            self.tool_calls_count += 1
+            self.needs_ui_update = True
 
     def add_symbols_to_queue(self, symbols):
         """Add a list of symbols to the analysis queue."""
-        self.analysis_queue.extend(symbols)
+        with self._lock:
+            self.analysis_queue.extend(symbols)
 
     def get_next_symbol(self):
         """Get the next symbol from the queue for analysis (without changing UI display)."""
-        if self.analysis_queue:
-            next_symbol = self.analysis_queue.pop(0)
-            
-            # Set the symbol being analyzed (backend tracking)
-            self.analyzing_symbol = next_symbol
-            
-            # Initialize state if needed
-            if next_symbol not in self.symbol_states:
-                self.init_symbol_state(next_symbol)
-            else:
-                # Reset session for existing symbol to start fresh analysis
-                self.start_new_session_for_symbol(next_symbol)
-            
-            # Don't auto-switch UI display - let user control which symbol to view
-            # Only set current_symbol if it's not already set (for initial setup)
-            if self.current_symbol is None:
-                self.current_symbol = next_symbol
-            
-            return next_symbol
-            
-        # No more symbols to analyze
-        self.analyzing_symbol = None
-        return None
+        with self._lock:
+            if self.analysis_queue:
+                next_symbol = self.analysis_queue.popleft()
+                
+                # Set the symbol being analyzed (backend tracking)
+                self.analyzing_symbol = next_symbol
+                
+                # Initialize state if needed
+                if next_symbol not in self.symbol_states:
+                    self.init_symbol_state(next_symbol)
+                else:
+                    # Reset session for existing symbol to start fresh analysis
+                    self.start_new_session_for_symbol(next_symbol)
+                
+                # Don't auto-switch UI display - let user control which symbol to view
+                # Only set current_symbol if it's not already set (for initial setup)
+                if self.current_symbol is None:
+                    self.current_symbol = next_symbol
+                
+                return next_symbol
+                
+            # No more symbols to analyze
+            self.analyzing_symbol = None
+            return None
 
     def get_state(self, symbol):
         """Get the state for a specific symbol."""
@@ -125,6 +414,18 @@ class AppState:
             return self.symbol_states.get(self.current_symbol)
         return None
 
+    def get_report_snapshot(self, symbol):
+        """Return copies of a symbol's agent statuses and reports taken together, or None.
+
+        Both are copied under the lock, so a reader never sees an agent marked completed
+        while its report body is still missing.
+        """
+        state = self.symbol_states.get(symbol)
+        if state is None:
+            return None
+        with self._lock:
+            return state.statuses_as_dict(), state.current_reports.copy()
+
     def get_analyzing_state(self):
         """Get the state for the symbol currently being analyzed."""
         if self.analyzing_symbol:
@@ -133,90 +434,52 @@ class AppState:
 
     def init_symbol_state(self, symbol):
         """Initialize the state for a new symbol."""
-        import time
-        import uuid
-        
         # Generate a new session ID for this symbol analysis
-        session_id = str(uuid.uuid4())[:8]
+        session_id = _new_session_id()
         session_start = time.time()
         
-        self.symbol_states[symbol] = {
-            "agent_statuses": {
-                "Market Analyst": "pending",
-                "Social Analyst": "pending",
-                "News Analyst": "pending",
-                "Fundamentals Analyst": "pending",
-                "Macro Analyst": "pending",
-                "Bull Researcher": "pending",
-                "Bear Researcher": "pending",
-                "Research Manager": "pending",
-                "Trader": "pending",
-                "Risky Analyst": "pending",
-                "Safe Analyst": "pending",
-                "Neutral Analyst": "pending",
-                "Portfolio Manager": "pending"
-            },
-            "current_reports": {
-                "market_report": None,
-                "sentiment_report": None,
-                "news_report": None,
-                "fundamentals_report": None,
-                "macro_report": None,
-                "bull_report": None,
-                "bear_report": None,
-                "research_manager_report": None,
-                "investment_plan": None, 
-                "trader_investment_plan": None,
-                "risky_report": None,
-                "safe_report": None,
-                "neutral_report": None,
-                "portfolio_decision": None,
-                "final_trade_decision": None
-            },
-            "agent_prompts": {
-                "market_report": None,
-                "sentiment_report": None,
-                "news_report": None,
-                "fundamentals_report": None,
-                "macro_report": None,
-                "bull_report": None,
-                "bear_report": None,
-                "research_manager_report": None,
-                "investment_plan": None, 
-                "trader_investment_plan": None,
-                "risky_report": None,
-                "safe_report": None,
-                "neutral_report": None,
-                "portfolio_decision": None,
-                "final_trade_decision": None
-            },
-            "investment_debate_state": None,
-            "analysis_complete": False,
-            "analysis_results": None,
-            "ticker_symbol": symbol,
-            "chart_data": None,
-            "chart_period": "1y",  # Default chart period
-            "session_id": session_id,
-            "session_start_time": session_start,
-            "report_timestamps": {}  # Track when each report was last updated
-        }
+        with self._lock:
+            # Re-initializing an existing symbol drops its reports from the running count
+            previous = self.symbol_states.get(symbol)
+            if previous and previous.nonempty_report_keys:
+                self.generated_reports_count -= len(previous.nonempty_report_keys)
+            self._completed_symbols.discard(symbol)
+            self._last_lengths.pop(symbol, None)
+            
+            self.symbol_states[symbol] = SymbolState(
+                ticker_symbol=symbol,
+                session_id=session_id,
+                session_start_time=session_start
+            )
 
-    def update_agent_status(self, agent, status, symbol=None):
-        """Update the status of an agent for a specific symbol (or current symbol if none specified)."""
+    def update_agent_status(self, agent, status, symbol=None, *, defer_ui_flag=False):
+        """Update the status of an agent for a specific symbol (or current symbol if none specified).
+
+        With defer_ui_flag the caller is responsible for setting needs_ui_update itself,
+        which lets process_chunk_updates raise it once per chunk.
+        """
         if symbol is None:
             symbol = self.analyzing_symbol or self.current_symbol
             
         state = self.get_state(symbol)
         if state:
-            if agent in state["agent_statuses"]:
-                if status not in ["pending", "in_progress", "completed"]:
-                    print(f"Warning: Invalid status '{status}' for agent '{agent}', defaulting to 'pending'")
+            index = AGENT_INDEX.get(agent)
+            if index is not None:
+                code = _STATUS_CODES.get(status)
+                if code is None:
+                    logger.warning("Invalid status '%s' for agent '%s', defaulting to 'pending'", status, agent)
                     status = "pending"
+                    code = STATUS_PENDING
                 
-                if state["agent_statuses"][agent] != status:
-                    state["agent_statuses"][agent] = status
-                    print(f"[STATE - {symbol}] Updated {agent} status to {status}")
-                    self.needs_ui_update = True
+                statuses = state.status_codes
+                with self._lock:
+                    changed = statuses[index] != code
+                    if changed:
+                        statuses[index] = code
+                        if not defer_ui_flag:
+                            self.needs_ui_update = True
+                if changed:
+                    logger.debug("[STATE - %s] Updated %s status to %s", symbol, agent, status)
 
     def store_agent_prompt(self, report_type, prompt_text, symbol=None):
         """Store the prompt used by an agent for a specific report type."""
@@ -224,9 +487,55 @@ class AppState:
             symbol = self.analyzing_symbol or self.current_symbol
             
         state = self.get_state(symbol)
-        if state and "agent_prompts" in state:
-            state["agent_prompts"][report_type] = prompt_text
-            print(f"[STATE - {symbol}] Stored prompt for {report_type} ({len(prompt_text)} chars)")
+        if state:
+            if state.agent_prompts is None:
+                state.agent_prompts = {}
+            state.agent_prompts[report_type] = prompt_text
+            logger.debug("[STATE - %s] Stored prompt for %s (%d chars)", symbol, report_type, len(prompt_text))
+
+    def store_report(self, report_type, content, symbol=None):
+        """Store a report for a specific symbol, keeping the generated reports count in step."""
+        if symbol is None:
+            symbol = self.analyzing_symbol or self.current_symbol
+            
+        state = self.get_state(symbol)
+        if state:
+            with self._lock:
+                self._set_report(state, report_type, content)
+
+    def _set_report(self, state, report_type, content):
+        """Write a report into a symbol state and update generated_reports_count incrementally.
+
+        Returns False without touching anything when the stored report is already identical.
+        """
+        if not _set_if_changed(state.current_reports, report_type, content):
+            return False
+        if state.report_lengths is None:
+            state.report_lengths = {}
+        state.report_lengths[report_type] = len(content) if isinstance(content, str) else 0
+        nonempty = state.nonempty_report_keys
+        if nonempty is None:
+            nonempty = state.nonempty_report_keys = set()
+        if _is_nonempty_report(content):
+            if report_type not in nonempty:
+                nonempty.add(report_type)
+                self.generated_reports_count += 1
+        elif report_type in nonempty:
+            nonempty.discard(report_type)
+            self.generated_reports_count -= 1
+        return True
+
+    def set_analysis_complete(self, symbol, complete=True):
+        """Set a symbol's analysis_complete flag and keep the completed-symbols set in step."""
+        state = self.get_state(symbol)
+        if not state:
+            return
+        with self._lock:
+            state.analysis_complete = complete
+            if complete:
+                self._completed_symbols.add(symbol)
+            else:
+                self._completed_symbols.discard(symbol)
 
     def get_agent_prompt(self, report_type, symbol=None):
         """Get the prompt used by an agent for a specific report type."""
@@ -234,216 +543,107 @@ class AppState:
             symbol = self.current_symbol
             
         state = self.get_state(symbol)
-        if state and "agent_prompts" in state:
-            return state["agent_prompts"].get(report_type)
+        if state and state.agent_prompts:
+            return state.agent_prompts.get(report_type)
         return None
 
     def reset(self):
         """Reset the application state for all symbols."""
-        print("[STATE] Resetting application state")
-        self.analysis_queue = []
-        self.symbol_states = {}
-        self.current_symbol = None
-        self.analysis_running = False
-        self.analysis_trace = []
-        self.tool_calls_count = 0
-        self.llm_calls_count = 0
-        # Reset the new tracking lists
-        self.tool_calls_log = []
-        self.llm_calls_log = []
-        self.generated_reports_count = 0
-        # Reset session tracking
-        self.current_session_id = None
-        self.session_start_time = None
+        logger.info("[STATE] Resetting application state")
+        with self._lock:
+            self.analysis_queue = collections.deque()
+            self.symbol_states = {}
+            self.current_symbol = None
+            self.analysis_running = False
+            self.analysis_trace = collections.deque(maxlen=_ANALYSIS_TRACE_MAXLEN)
+            self.tool_calls_count = 0
+            self.llm_calls_count = 0
+            # Reset the new tracking lists
+            self.tool_calls_log = collections.deque(maxlen=_TOOL_CALLS_LOG_MAXLEN)
+            self.llm_calls_log = collections.deque(maxlen=_LLM_CALLS_LOG_MAXLEN)
+            self._llm_call_count = 0
+            self._reasoning_count = 0
+            self.generated_reports_count = 0
+            self._completed_symbols.clear()
+            self._last_lengths.clear()
+            # Reset session tracking
+            self.current_session_id = None
+            self.session_start_time = None
 
     def get_tool_calls_for_display(self, agent_filter=None, symbol_filter=None):
         """Get tool calls in a consistent format for UI display, optionally filtered by agent type and symbol"""
+        agent_filter_lower = agent_filter.lower() if agent_filter else None
+        symbol_filter_upper = symbol_filter.upper() if symbol_filter else None
+        with self._lock:
+            tool_calls = list(self.tool_calls_log)
         formatted_calls = []
         
-        for call in self.tool_calls_log:
-            if isinstance(call, dict):
-                # New format - already has all the data we need
-                formatted_calls.append(call)
-            elif isinstance(call, tuple) and len(call) >= 3:
-                # Old format - convert to new format
-                timestamp, tool_name, inputs = call[:3]
-                formatted_call = {
-                    "timestamp": timestamp,
-                    "tool_name": tool_name,
-                    "inputs": inputs,
-                    "output": "Output not available (old format)",
-                    "execution_time": "Unknown",
-                    "status": "completed",
-                    "agent_type": "Unknown Agent"  # Old format doesn't have agent info
-                }
-                formatted_calls.append(formatted_call)
-            else:
-                # Invalid format - create error entry
-                formatted_call = {
-                    "timestamp": "Unknown",
-                    "tool_name": "Invalid Entry",
-                    "inputs": {},
-                    "output": f"Invalid tool call format: {str(call)}",
-                    "execution_time": "Unknown",
-                    "status": "error",
-                    "agent_type": "Unknown Agent"
-                }
-                formatted_calls.append(formatted_call)
-        
-        # Filter by agent type if specified
-        if agent_filter:
-            filtered_calls = []
-            for call in formatted_calls:
+        for call in tool_calls:
+            # Filter by agent type using flexible matching
+            if agent_filter_lower is not None:
                 agent_type = call.get("agent_type", "").lower()
-                # Match agent types using flexible matching
-                if agent_filter.lower() in agent_type or self._matches_agent_type(agent_filter, agent_type):
-                    filtered_calls.append(call)
-            formatted_calls = filtered_calls
+                if not self._matches_agent_type(agent_filter, agent_type, agent_filter_lower):
+                    continue
             
-        # Filter by symbol if specified
-        if symbol_filter:
-            filtered_calls = []
-            for call in formatted_calls:
+            # Filter by symbol (case-insensitive)
+            if symbol_filter_upper is not None:
                 call_symbol = call.get("symbol")
-                # Match symbol (case-insensitive)
-                if call_symbol and call_symbol.upper() == symbol_filter.upper():
-                    filtered_calls.append(call)
-            formatted_calls = filtered_calls
+                if not call_symbol or call_symbol.upper() != symbol_filter_upper:
+                    continue
+            
+            formatted_calls.append(call)
         
         return formatted_calls
     
-    def _matches_agent_type(self, filter_type, agent_type):
-        """Helper method to match agent types with flexible naming"""
-        # Mapping of report types to agent names
-        agent_mappings = {
-            "market_report": ["market analyst", "market", "technical analyst"],
-            "sentiment_report": ["social analyst", "social", "sentiment analyst"],
-            "news_report": ["news analyst", "news"],
-            "fundamentals_report": ["fundamentals analyst", "fundamental analyst", "fundamentals"],
-            "macro_report": ["macro analyst", "macro", "macroeconomic analyst"],
-            "bull_report": ["bull researcher", "bull", "optimistic researcher"],
-            "bear_report": ["bear researcher", "bear", "pessimistic researcher"],
-            "research_manager_report": ["research manager", "manager"],
-            "trader_investment_plan": ["trader", "trading", "portfolio manager"],
-            "final_trade_decision": ["portfolio manager", "final", "decision"]
-        }
-        
-        filter_lower = filter_type.lower()
-        agent_lower = agent_type.lower()
-        
+    def _matches_agent_type(self, filter_type, agent_lower, filter_lower):
+        """Helper method to match agent types with flexible naming; both inputs are pre-lowercased"""
         # Direct match
         if filter_lower in agent_lower:
             return True
             
         # Check mappings
-        if filter_type in agent_mappings:
-            for mapping in agent_mappings[filter_type]:
-                if mapping in agent_lower:
-                    return True
-                    
-        return False
+        mappings = _AGENT_MAPPINGS.get(filter_type)
+        return bool(mappings) and any(m in agent_lower for m in mappings)
         
     def reset_for_loop(self):
         """Reset state for the next loop iteration without stopping the loop."""
-        import time
-        import uuid
-        print("[STATE] Resetting state for next loop iteration")
-        self.analysis_queue = []
-        
-        # Reset analysis data for each symbol but KEEP the symbol states for pagination
-        for symbol in self.symbol_states:
-            state = self.symbol_states[symbol]
-            # Generate new session tracking for this reset
-            new_session_id = str(uuid.uuid4())[:8]
-            new_session_start = time.time()
+        logger.info("[STATE] Resetting state for next loop iteration")
+        with self._lock:
+            self.analysis_queue = collections.deque()
             
-            # Reset analysis-specific data but keep ticker_symbol for pagination
-            state.update({
-                "analysis_running": False,
-                "analysis_complete": False,
-                "current_reports": {
-                    "market_report": None,
-                    "sentiment_report": None,
-                    "news_report": None,
-                    "fundamentals_report": None,
-                    "macro_report": None,
-                    "bull_report": None,
-                    "bear_report": None,
-                    "research_manager_report": None,
-                    "trader_investment_plan": None,
-                    "risky_report": None,
-                    "safe_report": None,
-                    "neutral_report": None,
-                    "portfolio_decision": None,
-                    "final_trade_decision": None
-                },
-                "agent_prompts": {
-                    "market_report": None,
-                    "sentiment_report": None,
-                    "news_report": None,
-                    "fundamentals_report": None,
-                    "macro_report": None,
-                    "bull_report": None,
-                    "bear_report": None,
-                    "research_manager_report": None,
-                    "trader_investment_plan": None,
-                    "risky_report": None,
-                    "safe_report": None,
-                    "neutral_report": None,
-                    "portfolio_decision": None,
-                    "final_trade_decision": None
-                },
-                "agent_statuses": {
-                    "Market Analyst": "pending",
-                    "Social Analyst": "pending", 
-                    "News Analyst": "pending",
-                    "Fundamentals Analyst": "pending",
-                    "Macro Analyst": "pending",
-                    "Bull Researcher": "pending",
-                    "Bear Researcher": "pending",
-                    "Research Manager": "pending",
-                    "Trader": "pending",
-                    "Risky Analyst": "pending",
-                    "Safe Analyst": "pending",
-                    "Neutral Analyst": "pending",
-                    "Portfolio Manager": "pending"
-                },
-                "analysis_results": None,
-                "recommended_action": None,
-                "chart_data": state.get("chart_data"),  # Preserve chart data
-                "chart_period": state.get("chart_period", "1y"),  # Preserve chart period
-                # Keep ticker_symbol for pagination
-                "ticker_symbol": state.get("ticker_symbol"),
-                # Reset session tracking
-                "session_id": new_session_id,
-                "session_start_time": new_session_start,
-                "report_timestamps": {}
-            })
+            # Reset analysis data for each symbol but KEEP the symbol states for pagination
+            for state in self.symbol_states.values():
+                state.reset_analysis(_new_session_id(), time.time())
         
-        self.current_symbol = None
-        self.analysis_trace = []
-        self.tool_calls_count = 0
-        self.llm_calls_count = 0
-        # Reset the new tracking lists
-        self.tool_calls_log = []
-        self.llm_calls_log = []
-        self.generated_reports_count = 0
-        self.needs_ui_update = True
+            self.current_symbol = None
+            self.analysis_trace = collections.deque(maxlen=_ANALYSIS_TRACE_MAXLEN)
+            self.tool_calls_count = 0
+            self.llm_calls_count = 0
+            # Reset the new tracking lists
+            self.tool_calls_log = collections.deque(maxlen=_TOOL_CALLS_LOG_MAXLEN)
+            self.llm_calls_log = collections.deque(maxlen=_LLM_CALLS_LOG_MAXLEN)
+            self._llm_call_count = 0
+            self._reasoning_count = 0
+            self.generated_reports_count = 0
+            self._completed_symbols.clear()
+            self._last_lengths.clear()
+            self.needs_ui_update = True
 
     def start_loop(self, symbols, config):
         """Start the looping mode with given symbols and configuration."""
         self.loop_enabled = True
         self.loop_symbols = symbols
         self.loop_config = config
+        self._completed_symbols.clear()
         self.stop_loop = False
-        print(f"[STATE] Starting loop mode with {len(symbols)} symbols, interval: {self.loop_interval_minutes} minutes")
+        logger.info("[STATE] Starting loop mode with %s symbols, interval: %s minutes", len(symbols), self.loop_interval_minutes)
 
     def stop_loop_mode(self):
         """Stop the looping mode."""
         self.stop_loop = True
         self.loop_enabled = False
         self.analysis_running = False
-        print("[STATE] Stopping loop mode")
+        logger.info("[STATE] Stopping loop mode")
 
     def start_market_hour_mode(self, symbols, config, hours):
         """Start the market hour trading mode with given symbols, configuration, and hours."""
@@ -452,56 +652,63 @@ class AppState:
         self.market_hour_config = config
         self.market_hours = hours
         self.stop_market_hour = False
-        print(f"[STATE] Starting market hour mode with {len(symbols)} symbols, hours: {hours}")
+        logger.info("[STATE] Starting market hour mode with %s symbols, hours: %s", len(symbols), hours)
 
     def stop_market_hour_mode(self):
         """Stop the market hour trading mode."""
         self.stop_market_hour = True
         self.market_hour_enabled = False
         self.analysis_running = False
-        print("[STATE] Stopping market hour mode")
+        logger.info("[STATE] Stopping market hour mode")
     
     def start_new_session_for_symbol(self, symbol):
         """Start a new analysis session for an existing symbol."""
-        import time
-        import uuid
-        
         if symbol in self.symbol_states:
             state = self.symbol_states[symbol]
             # Generate new session tracking
-            state["session_id"] = str(uuid.uuid4())[:8]
-            state["session_start_time"] = time.time()
-            state["report_timestamps"] = {}
-            print(f"[STATE] Started new analysis session {state['session_id']} for {symbol}")
+            state.session_id = _new_session_id()
+            state.session_start_time = time.time()
+            state.report_timestamps = {}
+            self._last_lengths.pop(symbol, None)
+            logger.info("[STATE] Started new analysis session %s for %s", state.session_id, symbol)
 
     def signal_trade_occurred(self):
         """Signal that a trade has occurred and Alpaca data should be refreshed."""
-        import time
         self.last_trade_time = time.time()
         self.alpaca_refresh_needed = True
-        print("[STATE] Trading event signaled - Alpaca refresh needed")
+        logger.info("[STATE] Trading event signaled - Alpaca refresh needed")
     
     def update_reports_count(self):
-        """Update the generated reports count across all symbols."""
-        total_reports = 0
-        for symbol_state in self.symbol_states.values():
-            reports = symbol_state.get("current_reports", {})
-            total_reports += sum(1 for content in reports.values() if content is not None and str(content).strip())
-        self.generated_reports_count = total_reports
+        """Recount generated reports across all symbols from scratch.
+
+        The count is maintained incrementally by store_report; this full rescan
+        is only needed to reconcile after reports were written some other way.
+        """
+        with self._lock:
+            total_reports = 0
+            for symbol_state in self.symbol_states.values():
+                reports = symbol_state.current_reports
+                nonempty = {report_type for report_type, content in reports.items() if _is_nonempty_report(content)}
+                symbol_state.nonempty_report_keys = nonempty
+                total_reports += len(nonempty)
+            self.generated_reports_count = total_reports
 
     def is_all_symbols_complete(self):
         """Check if all symbols in the current analysis are complete."""
-        if not self.loop_symbols:
-            return False
-        
-        for symbol in self.loop_symbols:
-            state = self.get_state(symbol)
-            if not state or not state.get("analysis_complete", False):
-                return False
-        return True
+        completed = self._completed_symbols
+        return bool(self.loop_symbols) and all(symbol in completed for symbol in self.loop_symbols)
 
     def process_chunk_updates(self, chunk):
         """Process chunk updates from the graph stream for the symbol currently being analyzed."""
+        with self._lock:
+            return self._process_chunk_updates(chunk)
+
+    def _process_chunk_updates(self, chunk):
+        """Apply a graph stream chunk to the analyzing symbol's state; the caller holds the lock."""
+        present = _RELEVANT_CHUNK_KEYS.intersection(chunk)
+        if not present:
+            return
+
         state = self.get_analyzing_state()
         if not state:
             # Fallback to current symbol if no analyzing symbol is set
@@ -510,60 +717,45 @@ class AppState:
                 return
 
         analyzing_symbol = self.analyzing_symbol or self.current_symbol
-        ui_update_needed = False
-
-        # Map report types to agent names
-        report_to_agent = {
-            "market_report": "Market Analyst",
-            "sentiment_report": "Social Analyst", 
-            "news_report": "News Analyst",
-            "fundamentals_report": "Fundamentals Analyst",
-            "macro_report": "Macro Analyst",
-            "bull_report": "Bull Researcher",
-            "bear_report": "Bear Researcher",
-            "research_manager_report": "Research Manager",
-            "investment_plan": "Trader",
-            "trader_investment_plan": "Trader",
-            "risky_report": "Risky Analyst",
-            "safe_report": "Safe Analyst",
-            "neutral_report": "Neutral Analyst",
-        }
+        dirty = 0
+        # Bind the hot containers and method once for the whole chunk
+        reports = state.current_reports
+        statuses = state.status_codes
+        update_status = self.update_agent_status
         
-        # Determine the analyst execution sequence based on user selection (if available)
-        default_sequence = [
-            "Market Analyst",
-            "Social Analyst",
-            "News Analyst",
-            "Fundamentals Analyst",
-            "Macro Analyst",
-        ]
-        # If the UI has stored the list of active analysts, respect that (and preserve order)
-        if hasattr(self, "active_analysts") and self.active_analysts:
-            # Keep only those analysts that are in the default ordering to avoid typos
-            analyst_sequence = [a for a in default_sequence if a in self.active_analysts]
-            # Fallback: if somehow none matched (e.g., custom ordering), just use the provided list
-            if not analyst_sequence:
-                analyst_sequence = list(self.active_analysts)
-        else:
-            analyst_sequence = default_sequence
+        # Size fingerprints of the debate/plan fields already applied for this symbol. With
+        # stream_mode="values" every chunk repeats the full state, so unchanged fields are skipped.
+        last_lengths = self._last_lengths.get(analyzing_symbol)
+        if last_lengths is None:
+            last_lengths = self._last_lengths[analyzing_symbol] = {}
+
+        # Determine the analyst execution sequence based on user selection (if available);
+        # memoized, since the selection rarely changes during a run
+        analyst_sequence = _build_analyst_sequence(tuple(self.active_analysts))
+        
+        # Sample the clock and bind the timestamps dict once for all reports in this chunk
+        current_time = time.time()
+        timestamps = state.report_timestamps
+        if timestamps is None:
+            timestamps = state.report_timestamps = {}
         
         # Update analyst reports and manage status transitions
-        for report_type in ["market_report", "sentiment_report", "news_report", "fundamentals_report", "macro_report"]:
-            if report_type in chunk:
+        # Streaming chunks usually carry at most one analyst report; keep workflow order when there are several
+        chunk_reports = _ANALYST_REPORT_TYPES & present
+        for report_type in _ANALYST_REPORT_ORDER:
+            if report_type in chunk_reports:
                 new_report = chunk[report_type]
                 # Skip if report content is None or empty/whitespace only
                 if new_report is None or (isinstance(new_report, str) and new_report.strip() == ""):
                     continue
                 
                 # Check for duplicate content using session-aware logic
-                import time
-                current_report = state["current_reports"].get(report_type)
-                agent = report_to_agent[report_type]
-                current_status = state["agent_statuses"].get(agent)
-                current_time = time.time()
+                current_report = reports.get(report_type)
+                agent = _REPORT_TO_AGENT[report_type]
+                current_status = statuses[AGENT_INDEX[agent]]
                 
                 # Get the last update timestamp for this report type
-                last_update_time = state.get("report_timestamps", {}).get(report_type, 0)
+                last_update_time = timestamps.get(report_type, 0)
                 
                 # Skip duplicates only if:
                 # 1. Content is exactly the same AND
@@ -571,7 +763,7 @@ class AppState:
                 # 3. It was updated recently (within 5 seconds to avoid stream spam)
                 is_duplicate = (
                     new_report == current_report and 
-                    current_status == "completed" and 
+                    current_status == STATUS_COMPLETED and 
                     (current_time - last_update_time) < 5
                 )
                 
@@ -579,13 +771,14 @@ class AppState:
                     continue
                 
                 # Store the report if it's genuinely new or different
-                if new_report != current_report or current_status != "completed":
+                if new_report != current_report or current_status != STATUS_COMPLETED:
                     # 🛡️ PROTECTION: Ensure UI gets final reports, not intermediate ones
                     # Once an analyst is completed, only accept significantly longer reports
                     # This prevents UI from showing incomplete streaming chunks
-                    if current_status == "completed":
-                        current_length = len(current_report or "")
-                        new_length = len(new_report or "")
+                    if current_status == STATUS_COMPLETED:
+                        report_lengths = state.report_lengths
+                        current_length = report_lengths.get(report_type, 0) if report_lengths else 0
+                        new_length = len(new_report)
                         
                         # Only accept new reports if they're at least 20% longer than current
                         # This allows final complete reports while blocking minor streaming updates
@@ -595,236 +788,195 @@ class AppState:
                             # print(f"[STATE - {self.current_symbol}] 🛡️ Blocking {report_type} update: {new_length} chars < required {min_required_length:.0f} chars (analyst completed)")
                             continue
                         else:
-                            print(f"[STATE - {analyzing_symbol}] 📊 Accepting larger final {report_type}: {new_length} chars (was {current_length})")
+                            logger.debug("[STATE - %s] 📊 Accepting larger final %s: %d chars (was %d)", analyzing_symbol, report_type, new_length, current_length)
                     
                     # Add safety check for excessive updates from the same analyst
-                    update_count_key = f"{report_type}_update_count"
-                    current_count = state.get(update_count_key, 0)
+                    update_counts = state.update_counts
+                    if update_counts is None:
+                        update_counts = state.update_counts = {}
+                    current_count = update_counts.get(report_type, 0)
                     
                     # If an analyst is producing too many different reports, there might be an issue
                     if current_count > 10:  # Allow max 10 updates per report type
-                        print(f"[STATE - {analyzing_symbol}] ⚠️ WARNING: {report_type} has been updated {current_count} times. Possible infinite loop detected.")
+                        logger.warning("[STATE - %s] ⚠️ %s has been updated %d times. Possible infinite loop detected.", analyzing_symbol, report_type, current_count)
                         if current_count > 15:  # Hard limit
-                            print(f"[STATE - {analyzing_symbol}] 🛑 BLOCKING further {report_type} updates to prevent hang")
+                            logger.warning("[STATE - %s] 🛑 BLOCKING further %s updates to prevent hang", analyzing_symbol, report_type)
                             continue
                     
-                    state["current_reports"][report_type] = new_report
-                    state.setdefault("report_timestamps", {})[report_type] = current_time
-                    state[update_count_key] = current_count + 1
+                    self._set_report(state, report_type, new_report)
+                    timestamps[report_type] = current_time
+                    update_counts[report_type] = current_count + 1
                     
-                    # Count unique non-empty reports across all symbols
                     if new_report:
-                        self.update_reports_count()
-                        
                         # Add debug logging for all analyst reports
-                        print(f"[STATE - {analyzing_symbol}] ✅ Updated {report_type} with content length: {len(new_report)} (update #{current_count + 1})")
-                        print(f"[STATE - {analyzing_symbol}] 📊 Total Generated Reports: {self.generated_reports_count}")
+                        logger.debug("[STATE - %s] ✅ Updated %s len=%d (update #%d)", analyzing_symbol, report_type, len(new_report), current_count + 1)
+                        logger.debug("[STATE - %s] 📊 Total Generated Reports: %d", analyzing_symbol, self.generated_reports_count)
                         
                         # Special debugging for macro report (simplified)
-                        if report_type == "macro_report":
-                            print(f"[STATE - {analyzing_symbol}] 📊 MACRO REPORT RECEIVED: {len(new_report)} chars")
+                        if report_type == "macro_report" and logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("[STATE - %s] 📊 MACRO REPORT RECEIVED: %d chars", analyzing_symbol, len(new_report))
                             
-                    ui_update_needed = True
+                    dirty |= DIRTY_ANALYSTS
 
                 # Special debugging for macro analyst (only when transitioning to in_progress)
-                if agent == "Macro Analyst" and current_status == "pending":
-                    print(f"[STATE - {analyzing_symbol}] 📊 MACRO ANALYST STATUS TRANSITION:")
-                    print(f"[STATE - {analyzing_symbol}] 📊   - Current status: {current_status}")
-                    print(f"[STATE - {analyzing_symbol}] 📊   - Report type: {report_type}")
+                if agent == _MACRO and current_status == STATUS_PENDING and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "[STATE - %s] 📊 MACRO ANALYST STATUS TRANSITION:\n"
+                        "  - Current status: %s\n"
+                        "  - Report type: %s",
+                        analyzing_symbol, _STATUS_NAMES[current_status], report_type,
+                    )
 
                 # Transition logic:
                 #   - If the agent is already "in_progress", receiving a report marks it "completed".
                 #   - Do NOT automatically move a "pending" agent to "in_progress" when a report
                 #     appears; the progression to "in_progress" is controlled explicitly when the
                 #     previous analyst completes.
-                if current_status == "in_progress":
+                if current_status == STATUS_IN_PROGRESS:
                     # Mark this analyst as completed and advance workflow
-                    self.update_agent_status(agent, "completed", analyzing_symbol)
-                    ui_update_needed = True
+                    update_status(agent, "completed", analyzing_symbol, defer_ui_flag=True)
+                    dirty |= DIRTY_ANALYSTS
 
                     # Special debugging for macro analyst completion
-                    if agent == "Macro Analyst":
-                        print(f"[STATE - {analyzing_symbol}] 📊 MACRO ANALYST COMPLETED!")
-                        print(f"[STATE - {analyzing_symbol}] 📊   - Transitioning from 'in_progress' to 'completed'")
+                    if agent == _MACRO and logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "[STATE - %s] 📊 MACRO ANALYST COMPLETED!\n"
+                            "  - Transitioning from 'in_progress' to 'completed'",
+                            analyzing_symbol,
+                        )
 
                     # Advance to the next analyst in the predefined sequence
                     if agent in analyst_sequence and agent != analyst_sequence[-1]:
                         next_analyst = analyst_sequence[analyst_sequence.index(agent) + 1]
-                        if state["agent_statuses"].get(next_analyst) == "pending":
-                            self.update_agent_status(next_analyst, "in_progress", analyzing_symbol)
-                            ui_update_needed = True
-                            print(f"[STATE - {analyzing_symbol}] ➡️ Advanced to next analyst: {next_analyst}")
+                        # Custom analyst names have no status slot and are skipped
+                        next_index = AGENT_INDEX.get(next_analyst)
+                        if next_index is not None and statuses[next_index] == STATUS_PENDING:
+                            update_status(next_analyst, "in_progress", analyzing_symbol, defer_ui_flag=True)
+                            dirty |= DIRTY_ANALYSTS
+                            logger.debug("[STATE - %s] ➡️ Advanced to next analyst: %s", analyzing_symbol, next_analyst)
                     elif agent == analyst_sequence[-1]:
-                        print(f"[STATE - {analyzing_symbol}] ✅ All {len(analyst_sequence)} analysts completed. Ready for research phase.")
+                        logger.debug("[STATE - %s] ✅ All %d analysts completed. Ready for research phase.", analyzing_symbol, len(analyst_sequence))
                         # Special debugging for macro analyst being the last
-                        if agent == "Macro Analyst":
-                            print(f"[STATE - {analyzing_symbol}] 📊 MACRO ANALYST was the final analyst in sequence!")
-                elif current_status == "pending" and new_report:
+                        if agent == _MACRO:
+                            logger.debug("[STATE - %s] 📊 MACRO ANALYST was the final analyst in sequence!", analyzing_symbol)
+                elif current_status == STATUS_PENDING and new_report:
                     # This might be a timing issue where report arrives before status is set to in_progress
                     # Just log it as info, not a warning
-                    print(f"[STATE - {analyzing_symbol}] 📝 Received {report_type} for {agent} (status: {current_status})")
+                    logger.debug("[STATE - %s] 📝 Received %s for %s (status: %s)", analyzing_symbol, report_type, agent, _STATUS_NAMES[current_status])
 
         # Research team debate state
-        if "investment_debate_state" in chunk:
+        if "investment_debate_state" in present:
             debate_state = chunk["investment_debate_state"]
             
             # Store the full debate state for chat UI access
-            state["investment_debate_state"] = debate_state
-            
-            # Bull researcher
-            if "bull_history" in debate_state and debate_state["bull_history"]:
-                # Only set to in_progress if currently pending (don't override completed status)
-                current_status = state["agent_statuses"].get("Bull Researcher")
-                if current_status == "pending":
-                    self.update_agent_status("Bull Researcher", "in_progress", analyzing_symbol)
-                # Use the latest message from bull_messages array if available, otherwise use full history
-                if "bull_messages" in debate_state and debate_state["bull_messages"]:
-                    latest_bull_message = debate_state["bull_messages"][-1]
-                    state["current_reports"]["bull_report"] = latest_bull_message
-                else:
-                    state["current_reports"]["bull_report"] = debate_state["bull_history"]
-                self.update_reports_count()
-                ui_update_needed = True
+            state.investment_debate_state = debate_state
             
-            # Bear researcher
-            if "bear_history" in debate_state and debate_state["bear_history"]:
+            for key, history_field, messages_field, agent, report_key in _RESEARCHER_BRANCHES:
+                history = debate_state.get(history_field)
+                if not history or last_lengths.get(key) == len(history):
+                    continue
+                last_lengths[key] = len(history)
+                # Use the latest message from the messages array if available, otherwise use full history
+                messages_list = debate_state.get(messages_field)
+                changed = self._set_report(state, report_key, messages_list[-1] if messages_list else history)
                 # Only set to in_progress if currently pending (don't override completed status)
-                current_status = state["agent_statuses"].get("Bear Researcher")
-                if current_status == "pending":
-                    self.update_agent_status("Bear Researcher", "in_progress", analyzing_symbol)
-                # Use the latest message from bear_messages array if available, otherwise use full history
-                if "bear_messages" in debate_state and debate_state["bear_messages"]:
-                    latest_bear_message = debate_state["bear_messages"][-1]
-                    state["current_reports"]["bear_report"] = latest_bear_message
-                else:
-                    state["current_reports"]["bear_report"] = debate_state["bear_history"]
-                self.update_reports_count()
-                ui_update_needed = True
+                if statuses[AGENT_INDEX[agent]] == STATUS_PENDING:
+                    update_status(agent, "in_progress", analyzing_symbol, defer_ui_flag=True)
+                    changed = True
+                if changed:
+                    dirty |= DIRTY_DEBATE
             
             # Research manager
-            if "judge_decision" in debate_state and debate_state["judge_decision"]:
-                self.update_agent_status("Bull Researcher", "completed", analyzing_symbol)
-                self.update_agent_status("Bear Researcher", "completed", analyzing_symbol)
-                self.update_agent_status("Research Manager", "completed", analyzing_symbol)
-                state["current_reports"]["research_manager_report"] = debate_state["judge_decision"]
-                state["current_reports"]["investment_plan"] = debate_state["judge_decision"]
-                self.update_agent_status("Trader", "in_progress", analyzing_symbol)
-                ui_update_needed = True
+            research_decision = debate_state.get("judge_decision")
+            if research_decision and last_lengths.get("research_judge") != len(research_decision):
+                last_lengths["research_judge"] = len(research_decision)
+                update_status(_BULL, "completed", analyzing_symbol, defer_ui_flag=True)
+                update_status(_BEAR, "completed", analyzing_symbol, defer_ui_flag=True)
+                update_status(_RESEARCH_MGR, "completed", analyzing_symbol, defer_ui_flag=True)
+                self._set_report(state, "research_manager_report", research_decision)
+                self._set_report(state, "investment_plan", research_decision)
+                update_status(_TRADER, "in_progress", analyzing_symbol, defer_ui_flag=True)
+                dirty |= DIRTY_DEBATE
         
         # Trader plan
-        if "trader_investment_plan" in chunk and chunk["trader_investment_plan"]:
-            state["current_reports"]["trader_investment_plan"] = chunk["trader_investment_plan"]
-            self.update_reports_count()
-            self.update_agent_status("Trader", "completed", analyzing_symbol)
-            self.update_agent_status("Risky Analyst", "in_progress", analyzing_symbol)
-            ui_update_needed = True
+        trader_plan = chunk["trader_investment_plan"] if "trader_investment_plan" in present else None
+        if trader_plan and last_lengths.get("trader") != len(trader_plan):
+            last_lengths["trader"] = len(trader_plan)
+            self._set_report(state, "trader_investment_plan", trader_plan)
+            update_status(_TRADER, "completed", analyzing_symbol, defer_ui_flag=True)
+            update_status(_RISKY, "in_progress", analyzing_symbol, defer_ui_flag=True)
+            dirty |= DIRTY_TRADER
         
         # Risk debate state
-        if "risk_debate_state" in chunk:
+        if "risk_debate_state" in present:
             risk_state = chunk["risk_debate_state"]
             
             # Store the full risk debate state for debugging and chat UI access
-            state["risk_debate_state"] = risk_state
-            
-            # Risky analyst
-            if "current_risky_response" in risk_state and risk_state["current_risky_response"]:
-                # Only set to in_progress if currently pending (don't override completed status)
-                current_status = state["agent_statuses"].get("Risky Analyst")
-                if current_status == "pending":
-                    self.update_agent_status("Risky Analyst", "in_progress", analyzing_symbol)
-                # Extract just the content without the "Risky Analyst:" prefix if present
-                risky_content = risk_state["current_risky_response"]
-                if risky_content.startswith("Risky Analyst: "):
-                    risky_content = risky_content[15:]  # Remove "Risky Analyst: " prefix
-                state["current_reports"]["risky_report"] = risky_content
-                self.update_reports_count()
-                # print(f"[STATE - {self.current_symbol}] Updated risky_report with content length: {len(risky_content)}")
-                ui_update_needed = True
+            state.risk_debate_state = risk_state
             
-            # Safe analyst
-            if "current_safe_response" in risk_state and risk_state["current_safe_response"]:
-                # Only set to in_progress if currently pending (don't override completed status)
-                current_status = state["agent_statuses"].get("Safe Analyst")
-                if current_status == "pending":
-                    self.update_agent_status("Safe Analyst", "in_progress", analyzing_symbol)
-                # Extract just the content without the "Safe Analyst:" prefix if present
-                safe_content = risk_state["current_safe_response"]
-                if safe_content.startswith("Safe Analyst: "):
-                    safe_content = safe_content[14:]  # Remove "Safe Analyst: " prefix
-                state["current_reports"]["safe_report"] = safe_content
-                self.update_reports_count()
-                # print(f"[STATE - {self.current_symbol}] Updated safe_report with content length: {len(safe_content)}")
-                ui_update_needed = True
-            
-            # Neutral analyst
-            if "current_neutral_response" in risk_state and risk_state["current_neutral_response"]:
+            # Responses are not append-only, so the history length is part of the fingerprint
+            for key, response_field, history_field, prefix, agent, report_key in _RISK_BRANCHES:
+                response = risk_state.get(response_field)
+                if not response:
+                    continue
+                fingerprint = (len(response), len(risk_state.get(history_field) or ""))
+                if last_lengths.get(key) == fingerprint:
+                    continue
+                last_lengths[key] = fingerprint
+                # Extract just the content without the speaker prefix if present
+                changed = self._set_report(state, report_key, response.removeprefix(prefix))
                 # Only set to in_progress if currently pending (don't override completed status)
-                current_status = state["agent_statuses"].get("Neutral Analyst")
-                if current_status == "pending":
-                    self.update_agent_status("Neutral Analyst", "in_progress", analyzing_symbol)
-                # Extract just the content without the "Neutral Analyst:" prefix if present
-                neutral_content = risk_state["current_neutral_response"]
-                if neutral_content.startswith("Neutral Analyst: "):
-                    neutral_content = neutral_content[17:]  # Remove "Neutral Analyst: " prefix
-                state["current_reports"]["neutral_report"] = neutral_content
-                self.update_reports_count()
-                # print(f"[STATE - {self.current_symbol}] Updated neutral_report with content length: {len(neutral_content)}")
-                ui_update_needed = True
+                if statuses[AGENT_INDEX[agent]] == STATUS_PENDING:
+                    update_status(agent, "in_progress", analyzing_symbol, defer_ui_flag=True)
+                    changed = True
+                if changed:
+                    dirty |= DIRTY_RISK
             
             # Portfolio manager - preserve individual reports when final decision is made
-            if "judge_decision" in risk_state and risk_state["judge_decision"]:
-                # Ensure individual reports are preserved from the debate history
-                if not state["current_reports"]["risky_report"] and "risky_history" in risk_state:
-                    risky_history = risk_state["risky_history"]
-                    if risky_history:
-                        state["current_reports"]["risky_report"] = risky_history.replace("Risky Analyst: ", "").strip()
-                
-                if not state["current_reports"]["safe_report"] and "safe_history" in risk_state:
-                    safe_history = risk_state["safe_history"]
-                    if safe_history:
-                        state["current_reports"]["safe_report"] = safe_history.replace("Safe Analyst: ", "").strip()
-                
-                if not state["current_reports"]["neutral_report"] and "neutral_history" in risk_state:
-                    neutral_history = risk_state["neutral_history"]
-                    if neutral_history:
-                        state["current_reports"]["neutral_report"] = neutral_history.replace("Neutral Analyst: ", "").strip()
-                
-                # Mark all as completed
-                self.update_agent_status("Risky Analyst", "completed", analyzing_symbol)
-                self.update_agent_status("Safe Analyst", "completed", analyzing_symbol)
-                self.update_agent_status("Neutral Analyst", "completed", analyzing_symbol)
-                self.update_agent_status("Portfolio Manager", "completed", analyzing_symbol)
+            risk_decision = risk_state.get("judge_decision")
+            if risk_decision and last_lengths.get("risk_judge") != len(risk_decision):
+                last_lengths["risk_judge"] = len(risk_decision)
+                # Ensure individual reports are preserved from the debate history, and mark all as completed
+                for _, _, history_field, prefix, agent, report_key in _RISK_BRANCHES:
+                    if not reports[report_key]:
+                        history = risk_state.get(history_field)
+                        if history:
+                            self._set_report(state, report_key, history.removeprefix(prefix).strip())
+                    update_status(agent, "completed", analyzing_symbol, defer_ui_flag=True)
+                update_status(_PORTFOLIO, "completed", analyzing_symbol, defer_ui_flag=True)
                 
                 # Set final decisions
-                state["current_reports"]["portfolio_decision"] = risk_state["judge_decision"]
-                state["current_reports"]["final_trade_decision"] = risk_state["judge_decision"]
+                self._set_report(state, "portfolio_decision", risk_decision)
+                self._set_report(state, "final_trade_decision", risk_decision)
                 
                 # Store extracted recommendation if available
                 if "recommended_action" in chunk:
-                    state["recommended_action"] = chunk["recommended_action"]
+                    state.recommended_action = chunk["recommended_action"]
                 
                 # Mark the overall analysis as complete once the Portfolio Manager has delivered the final decision
-                state["analysis_complete"] = True
+                self.set_analysis_complete(analyzing_symbol)
                 
-                print(f"[STATE - {analyzing_symbol}] Final decision set. Reports status:")
-                print(f"  risky_report: {len(state['current_reports']['risky_report'] or '') > 0}")
-                print(f"  safe_report: {len(state['current_reports']['safe_report'] or '') > 0}")
-                print(f"  neutral_report: {len(state['current_reports']['neutral_report'] or '') > 0}")
-                print(f"  final_trade_decision: {len(state['current_reports']['final_trade_decision'] or '') > 0}")
+                # Emit the summary as a single record rather than one write per line
+                if logger.isEnabledFor(logging.INFO):
+                    msgs = [f"[STATE - {analyzing_symbol}] Final decision set. Reports status:"]
+                    for key in ("risky_report", "safe_report", "neutral_report", "final_trade_decision"):
+                        msgs.append(f"  {key}: {bool(reports[key])}")
+                    logger.info("\n".join(msgs))
                 
-                ui_update_needed = True
+                dirty |= DIRTY_RISK
         
         # Proper tracking of LLM calls and tool calls (similar to CLI implementation)
-        if "messages" in chunk and len(chunk.get("messages", [])) > 0:
-            import datetime
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+        messages = chunk["messages"] if "messages" in present else None
+        if messages:
+            timestamp = time.strftime("%H:%M:%S")
             
             # Process each message in the chunk
-            for message in chunk["messages"]:
+            for message in messages:
                 # Extract message content and type
                 if hasattr(message, "content"):
                     content = message.content
                     msg_type = "Reasoning"  # LLM reasoning calls
+                    self._reasoning_count += 1
                 else:
                     content = str(message)
                     msg_type = "System"
@@ -835,41 +987,35 @@ class AppState:
                 # Note: Tool calls are now tracked directly in agent_utils.py timing_wrapper
                 # No need to parse them from message chunks
             
-            # Update LLM calls count
-            has_llm_calls = any(call[1] == "LLM_CALL" for call in self.llm_calls_log)
-            if has_llm_calls:
-                self.llm_calls_count = len([call for call in self.llm_calls_log if call[1] == "LLM_CALL"])
-            else:
-                self.llm_calls_count = len([call for call in self.llm_calls_log if call[1] == "Reasoning"])
+            # Update LLM calls count, preferring explicitly registered calls
+            self.llm_calls_count = self._llm_call_count or self._reasoning_count
             
             # Tool calls count is updated directly in timing_wrapper, no need to recalculate here
             
             # Debug output for message processing
-            if len(chunk.get("messages", [])) > 0:
-                print(f"[STATE] Processed {len(chunk['messages'])} messages")
-                print(f"[STATE] Updated counts - Tool Calls: {self.tool_calls_count}, LLM Calls: {self.llm_calls_count}")
+            logger.debug(
+                "[STATE] Processed %d messages\n[STATE] Updated counts - Tool Calls: %d, LLM Calls: %d",
+                len(messages), self.tool_calls_count, self.llm_calls_count,
+            )
             
-            ui_update_needed = True
+            dirty |= DIRTY_MESSAGES
                 
-        # Set the first analyst to in_progress when analysis starts (detect initial human message)
-        if "messages" in chunk and chunk["messages"]:
-            for message in chunk["messages"]:
-                # Check if this is the initial human message that starts the analysis
-                if hasattr(message, 'type') and message.type == "human":
-                    # Only set an analyst to in_progress if NONE are currently in progress
-                    if not any(status == "in_progress" for status in state["agent_statuses"].values()):
-                        # Use the same dynamic analyst_sequence defined above
-                        for analyst in analyst_sequence:
-                            if state["agent_statuses"].get(analyst) == "pending":
-                                self.update_agent_status(analyst, "in_progress", analyzing_symbol)
-                                ui_update_needed = True
-                                break  # Only set the first pending analyst
-                    break  # Only process the first human message
-
-        # Set the UI update flag if any changes were made
-        if ui_update_needed:
+        # Set the first analyst to in_progress when analysis starts (detect initial human message).
+        # Only needed while NO analyst is in progress, which is checked once up front.
+        if messages and STATUS_IN_PROGRESS not in statuses:
+            # Check if there is a human message that starts the analysis
+            if any(getattr(message, "type", None) == "human" for message in messages):
+                # Use the same dynamic analyst_sequence defined above
+                for analyst in analyst_sequence:
+                    index = AGENT_INDEX.get(analyst)
+                    if index is not None and statuses[index] == STATUS_PENDING:
+                        update_status(analyst, "in_progress", analyzing_symbol, defer_ui_flag=True)
+                        dirty |= DIRTY_ANALYSTS
+                        break  # Only set the first pending analyst
+
+        # Flag the UI once for the whole chunk
+        if dirty:
             self.needs_ui_update = True
-            # print(f"[STATE] Setting needs_ui_update flag due to chunk updates")
 
 # Create a global instance
 app_state = AppState() 
\ No newline at end of file
@@ -12,7 +12,7 @@ def apply_report_mapping_fix():
     sys.path.insert(0, project_root)
     
     try:
-        from webui.utils.state import AppState
+        from webui.utils.state import AGENT_INDEX, STATUS_IN_PROGRESS, AppState
         
         # Patch the process_chunk_updates method to fix report mapping
         original_process_chunk_updates = AppState.process_chunk_updates
@@ -33,7 +33,7 @@ def apply_report_mapping_fix():
                 current_symbol = getattr(self, 'current_symbol', '')
                 if current_symbol:
                     state = self.get_state(current_symbol)
-                    if state and state["agent_statuses"].get("Social Analyst") == "in_progress":
+                    if state and state.status_codes[AGENT_INDEX["Social Analyst"]] == STATUS_IN_PROGRESS:
                         # This is the bug! Social Analyst is incorrectly updating market_report
                         # print(f"[FIX] Detected Social Analyst incorrectly updating market_report - fixing...")
                         # Move the content to sentiment_report
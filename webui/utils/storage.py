@@ -2,7 +2,9 @@
 Storage utility for persisting user settings in localStorage
 """
 
-from typing import Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
 
 # Default settings structure
 DEFAULT_SETTINGS = {
@@ -35,6 +37,10 @@ DEFAULT_API_KEYS = {
     "alpaca-paper": True
 }
 
+# Shared read-only views for callers that only look up default values
+_DEFAULT_SETTINGS_VIEW = MappingProxyType(DEFAULT_SETTINGS)
+_DEFAULT_API_KEYS_VIEW = MappingProxyType(DEFAULT_API_KEYS)
+
 
 def get_default_settings() -> Dict[str, Any]:
     """Get the default settings structure"""
@@ -46,13 +52,25 @@ def get_default_api_keys() -> Dict[str, Any]:
     return DEFAULT_API_KEYS.copy()
 
 
+def get_default_settings_view() -> Mapping[str, Any]:
+    """Get a read-only view of the default settings structure"""
+    return _DEFAULT_SETTINGS_VIEW
+
+
+def get_default_api_keys_view() -> Mapping[str, Any]:
+    """Get a read-only view of the default API keys structure"""
+    return _DEFAULT_API_KEYS_VIEW
+
+
+@lru_cache(maxsize=None)
 def create_storage_store_component():
-    """Create a dcc.Store component for localStorage persistence"""
+    """Create a dcc.Store component for localStorage persistence (built once and reused)"""
     from dash import dcc
     return dcc.Store(id='settings-store', storage_type='local', data=DEFAULT_SETTINGS)
 
 
+@lru_cache(maxsize=None)
 def create_api_keys_store_component():
-    """Create a dcc.Store component for API keys localStorage persistence"""
+    """Create a dcc.Store component for API keys localStorage persistence (built once and reused)"""
     from dash import dcc
     return dcc.Store(id='api-keys-store', storage_type='local', data=DEFAULT_API_KEYS)